@@ -201,10 +201,6 @@ def mzml_to_df(file: str | Path | IO[bytes],
     if isinstance(file, str):
         file = Path(file)
     
-    # parse xml file
-    tree = ET.parse(file)
-    root = tree.getroot()
-    
     # if a list of fields is supplied, create output dict with only those fields, else, create one with all fields
     # Note:
     if fields is None:
@@ -212,26 +208,38 @@ def mzml_to_df(file: str | Path | IO[bytes],
     elif not all(i in available_fields for i in fields):
         raise ValueError("Invalid field name given. The following fields are valid:\n\n{}".format("\n".join(available_fields)))
     
-    # setup dictionary to store all field data per spectrum
-    metadata = dict()
+    # setup dictionary to store all field data per spectrum, experiment
+    # metadata is filled in once the run element has been parsed
+    metadata = dict.fromkeys(exp_data_extractors.keys())
     scans = {k: [] for k in fields}
     relevant_fields = set(fields)
-    
-    # fetch experiment metadata
-    run_item = root.find('{*}mzML/{*}run')
-    for field in exp_data_extractors.keys():
-        metadata[field] = exp_data_extractors[field](run_item)
 
-    # parse spectra
+    # peak data only has to be fetched for all spectra if peak arrays are requested
+    fetch_peaks = bool(relevant_fields.intersection(('m/z array', 'intensity array')))
+    
+    # stream through xml file, spectrum elements are processed and cleared as
+    # soon as they are parsed, such that the full document (including binary
+    # peak data) is never held in memory.
     update_metadata = False
-    for element in root.findall('{*}mzML/{*}run/{*}spectrumList/{*}spectrum'):
+    for _, element in ET.iterparse(file, events=('end',)):
+        tag = element.tag.rpartition('}')[2]
+
+        # fetch experiment metadata once the run element is complete
+        if tag == 'run':
+            for field in exp_data_extractors.keys():
+                metadata[field] = exp_data_extractors[field](element)
+            continue
+        elif tag != 'spectrum':
+            continue
+
         # setup data structure to store xml fetched data
         spec_data = dict()
 
         # fetch spectrum attributes and cvParam data
         spec_data["spectrum dict"] = _parse_element_data(element)
         spec_data["scan dict"] = _get_scan_data(element)
-        spec_data["peaks dict"] = _get_peaks_data(element)
+        if fetch_peaks is True or update_metadata is False:
+            spec_data["peaks dict"] = _get_peaks_data(element)
 
         # only assign precursor dict if ms2 scan given
         ms_level = spectral_data_extractors['MS level'](spec_data)
@@ -253,6 +261,9 @@ def mzml_to_df(file: str | Path | IO[bytes],
             metadata['binary type'] = spectral_data_extractors['intensity array binary type'](spec_data)
             metadata['byte order'] = 'little endian'
             update_metadata = True
+
+        # release parsed spectrum content
+        element.clear()
     
     # format spectrum data into dataframe
     scan_data = pd.DataFrame(scans)
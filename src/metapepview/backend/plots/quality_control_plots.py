@@ -11,10 +11,12 @@ import json
 from math import log10
 import pandas as pd
 import numpy as np
-from itertools import chain
+from itertools import chain, cycle
 
 from metapepview.backend.types import MetaPepDbSearch, MetaPepDeNovo
-from metapepview.backend.type_operations import assert_db_search_compatibility, assert_de_novo_compatibility
+from metapepview.backend.type_operations import assert_db_search_compatibility, \
+    assert_de_novo_compatibility, \
+    peptide_mz_rt_charge_arrays
 from metapepview.backend.post_processing import reference_score_distribution, reference_score_dist_peaks
 from metapepview.backend.spectral_ref_builder import *
 from metapepview.backend.utils.graph_utils import *
@@ -207,9 +209,7 @@ def tic_over_rt_plot(mzml_df: pd.DataFrame,
     fig.update_layout(margin=dict(l=20, r=20, t=10, b=10),
                       paper_bgcolor='rgba(0,0,0,0)',
                       plot_bgcolor='rgba(0,0,0,0)')
-    fig.update_yaxes(gridcolor=GraphConstants.gridcolor, 
-                     gridwidth=GraphConstants.gridwidth,
-                     zerolinecolor="Black",
+    fig.update_yaxes(**GraphConstants.grid_axis_layout,
                      range=[0, None], 
                      nticks=4)
     fig.update_xaxes(gridcolor="rgba(0,0,0,0)", 
@@ -252,10 +252,11 @@ def mz_over_rt_plot(dataset: pd.DataFrame,
                     db_search_psm: MetaPepDbSearch | None = None,
                     de_novo: MetaPepDeNovo | None = None,
                     int_cutoff: int | float | None = None):
-    # Compute moving average of intensity over rt
-    tic_df = dataset[dataset['MS level'] == 1]
-    tic_df = tic_df[['scan number', 'total ion current', 'retention time']]
-    tic_df['total ion current EMA'] = tic_df['total ion current'].ewm(span=100).mean()
+    # Compute moving average of intensity over rt, only the MS1 tic and rt
+    # columns are needed for the left panel
+    ms1_mask = (dataset['MS level'] == 1).to_numpy()
+    tic_rt = dataset['retention time'].to_numpy()[ms1_mask]
+    tic_ema = dataset['total ion current'][ms1_mask].ewm(span=100).mean().to_numpy()
 
     dataset = dataset[['scan number', 'precursor m/z', 'retention time', 'total ion current']]
     dataset = dataset.astype(float)
@@ -267,8 +268,8 @@ def mz_over_rt_plot(dataset: pd.DataFrame,
     fig = make_subplots(rows=1, cols=2, shared_yaxes=True,
                         column_widths=[0.15, 0.85], horizontal_spacing=0.02)
 
-    fig.add_trace(go.Scatter(x=tic_df["total ion current EMA"],
-                             y=tic_df["retention time"],
+    fig.add_trace(go.Scatter(x=tic_ema,
+                             y=tic_rt,
                              mode="lines",
                              showlegend=False,
                              line=dict(color=GraphConstants.primary_color,
@@ -286,19 +287,18 @@ def mz_over_rt_plot(dataset: pd.DataFrame,
         dataset = match_db_search_psm(dataset, db_search_psm.data)
         # fig = px.scatter(dataset, x="precursor m/z", y="retention time", color="db search identified")
         
-        palette = iter(GraphConstants.color_palette)
-        for i, category in enumerate(dataset['db search identified'].unique()):
-            cat_df = dataset[dataset['db search identified'] == category]
+        traces = []
+        for i, (category, cat_df) in enumerate(dataset.groupby('db search identified', sort=False)):
             # fig.add_trace(go.Histogram2dContour(
             #     x=cat_df["precursor m/z"], y=cat_df["retention time"], opacity=0.4, colorscale=scales[i]),
             #               row=1, col=2)
 
-            fig.add_trace(go.Scattergl(x=cat_df["precursor m/z"], y=cat_df["retention time"],
+            traces.append(go.Scattergl(x=cat_df["precursor m/z"], y=cat_df["retention time"],
                                        mode='markers',
                                        name=str(category),
                                        marker_size=2,
-                                       marker_color=next(palette)),
-                          row=1, col=2)
+                                       marker_color=GraphConstants.color_palette[i]))
+        fig.add_traces(traces, rows=1, cols=2)
         
         fig.update_layout(legend={'title': 'db search identified', 'itemsizing': 'constant'})
         
@@ -306,15 +306,14 @@ def mz_over_rt_plot(dataset: pd.DataFrame,
         dataset = match_de_novo(dataset, de_novo.data)
         # fig = px.scatter(dataset, x="precursor m/z", y="retention time", color="de novo identified")
         
-        palette = iter(GraphConstants.color_palette)
-        for category in dataset['de novo identified'].unique():
-            cat_df = dataset[dataset['de novo identified'] == category]
-            fig.add_trace(go.Scattergl(x=cat_df["precursor m/z"], y=cat_df["retention time"],
+        traces = []
+        for i, (category, cat_df) in enumerate(dataset.groupby('de novo identified', sort=False)):
+            traces.append(go.Scattergl(x=cat_df["precursor m/z"], y=cat_df["retention time"],
                                        mode='markers',
                                        name=str(category),
                                        marker_size=2,
-                                       marker_color=next(palette)),
-                          row=1, col=2)
+                                       marker_color=GraphConstants.color_palette[i]))
+        fig.add_traces(traces, rows=1, cols=2)
 
         fig.update_layout(legend= {'title': 'de novo identified','itemsizing': 'constant'})
         
@@ -337,14 +336,10 @@ def mz_over_rt_plot(dataset: pd.DataFrame,
                           col=2)
         
     fig.update_xaxes(title="precursor m/z",
-                     gridcolor=GraphConstants.gridcolor,
-                     gridwidth=GraphConstants.gridwidth, 
-                     zerolinecolor="Black",
+                     **GraphConstants.grid_axis_layout,
                      row=1,
                      col=2)
-    fig.update_yaxes(gridcolor=GraphConstants.gridcolor,
-                     gridwidth=GraphConstants.gridwidth,
-                     zerolinecolor="Black",
+    fig.update_yaxes(**GraphConstants.grid_axis_layout,
                      row=1,
                      col=2)
     fig.update_layout(margin=dict(l=20, r=20, t=10, b=10),
@@ -383,14 +378,12 @@ def scan_tic_dist_plot(dataset: pd.DataFrame,
         dataset['de novo identified'] = np.nan
     
     # categorize scans by db search, de novo or no identification
-    def partition_ident(row):
-        if row["db search identified"] is True:
-            return "db search"
-        elif row["de novo identified"] is True:
-            return "de novo only (> {} {})".format(alc_cutoff, de_novo_conf_format)
-        else:
-            return "unidentified"
-    dataset['identification'] = dataset.apply(partition_ident, axis=1)
+    dataset['identification'] = np.select(
+        [dataset["db search identified"].eq(True).to_numpy(),
+         dataset["de novo identified"].eq(True).to_numpy()],
+        ["db search",
+         "de novo only (> {} {})".format(alc_cutoff, de_novo_conf_format)],
+        default="unidentified")
     
     # log transform tic
     dataset['total ion current'] = dataset['total ion current'].apply(log10)
@@ -474,28 +467,28 @@ def ms1_int_over_ms2_int(dataset: pd.DataFrame,
     if db_search_psm is not None:
         dataset = match_db_search_psm(dataset, db_search_psm.data)
         
-        palette = iter(GraphConstants.color_palette)
-        for category in dataset['db search identified'].unique():
-            cat_df = dataset[dataset['db search identified'] == category]
-            fig.add_trace(go.Scattergl(x=cat_df["precursor intensity"], y=cat_df[y_col],
+        traces = []
+        for i, (category, cat_df) in enumerate(dataset.groupby('db search identified', sort=False)):
+            traces.append(go.Scattergl(x=cat_df["precursor intensity"], y=cat_df[y_col],
                                        name=str(category), mode='markers', opacity=0.5,
                                        marker_size=2,
-                                       marker_color=next(palette)))
-            fig.update_layout(legend= {'title': 'db search identified','itemsizing': 'constant'})
+                                       marker_color=GraphConstants.color_palette[i]))
+        fig.add_traces(traces)
+        fig.update_layout(legend= {'title': 'db search identified','itemsizing': 'constant'})
     elif de_novo is not None:
         dataset = match_de_novo(dataset, de_novo.data)
         
-        palette = iter(GraphConstants.color_palette)
-        for category in dataset['de novo identified'].unique():
-            cat_df = dataset[dataset['de novo identified'] == category]
-            fig.add_trace(go.Scattergl(x=cat_df["precursor intensity"], 
+        traces = []
+        for i, (category, cat_df) in enumerate(dataset.groupby('de novo identified', sort=False)):
+            traces.append(go.Scattergl(x=cat_df["precursor intensity"], 
                                        y=cat_df[y_col],
                                        name=str(category), 
                                        mode='markers', 
                                        opacity=0.5,
                                        marker_size=2,
-                                       marker_color=next(palette)))
-            fig.update_layout(legend= {'title': 'de novo identified','itemsizing': 'constant'})
+                                       marker_color=GraphConstants.color_palette[i]))
+        fig.add_traces(traces)
+        fig.update_layout(legend= {'title': 'de novo identified','itemsizing': 'constant'})
     else:
         fig.add_trace(go.Scattergl(x=dataset["precursor intensity"], 
                                    y=dataset[y_col], 
@@ -512,15 +505,11 @@ def ms1_int_over_ms2_int(dataset: pd.DataFrame,
     fig.update_layout(legend={'itemsizing': 'constant'})
     fig.update_xaxes(title="precursor intensity", 
                      type='log', 
-                     gridcolor=GraphConstants.gridcolor,
-                     gridwidth=GraphConstants.gridwidth, 
-                     zerolinecolor="Black", 
+                     **GraphConstants.grid_axis_layout, 
                      nticks=6)
     fig.update_yaxes(title=ytitle, 
                      type='log', 
-                     gridcolor=GraphConstants.gridcolor,
-                     gridwidth=GraphConstants.gridwidth,
-                     zerolinecolor="Black",
+                     **GraphConstants.grid_axis_layout,
                      nticks=6)
     
     # if min_mz > 0 and peaks is not None:
@@ -528,7 +517,8 @@ def ms1_int_over_ms2_int(dataset: pd.DataFrame,
     # else:
     #     fig.update_layout(title="relation precursor tic to MS2 tic")
     
-    upper_bound = dataset[["total ion current", "precursor intensity"]].max(axis=None)
+    upper_bound = max(np.nanmax(dataset["total ion current"].to_numpy()),
+                      np.nanmax(dataset["precursor intensity"].to_numpy()))
     fig.add_shape(type="line", x0=1000, y0=1000, x1=upper_bound, y1=upper_bound,
                   line=dict(width=2, dash="dot"))
     fig.update_layout(margin=dict(l=20, r=20, t=10, b=10),
@@ -608,14 +598,10 @@ def confidence_dist_plot(db_search: MetaPepDbSearch | None,
                       plot_bgcolor='rgba(0,0,0,0)',
                       yaxis2=dict(tickmode="sync")
                       )
-    fig.update_yaxes(gridcolor=GraphConstants.gridcolor,
-                     gridwidth=GraphConstants.gridwidth, 
-                     zerolinecolor="Black",
+    fig.update_yaxes(**GraphConstants.grid_axis_layout,
                      secondary_y=False, 
                      nticks=6)
-    fig.update_yaxes(gridcolor=GraphConstants.gridcolor, 
-                     gridwidth=GraphConstants.gridwidth, 
-                     zerolinecolor="Black",
+    fig.update_yaxes(**GraphConstants.grid_axis_layout,
                      secondary_y=True, 
                      nticks=6)
     
@@ -633,113 +619,120 @@ def charge_dist_plot(features: pd.DataFrame,
 
     # get correct columns and match to db search and de novo
     dataset = features[['monoisotopic m/z', 'charge', 'retention time']].copy()
-    feature_mz_array = dataset['monoisotopic m/z'].to_numpy()
-    feature_rt_array = dataset['retention time'].to_numpy()
     feature_charge_array = dataset['charge'].to_numpy()
-    charge_cats = np.sort(np.unique(feature_charge_array))
+    charge_cats = np.unique(feature_charge_array)
+
+    # store charge states as ordered categories to group on integer codes
+    dataset['charge'] = dataset['charge'].astype(
+        pd.CategoricalDtype(categories=charge_cats, ordered=True))
+
+    # without identification data, only plot the charge distribution
+    if db_search is None and de_novo is None:
+        dataset_groups = dataset["charge"]\
+            .value_counts(sort=False)\
+            .sort_index()\
+            .reset_index(name="Feature count")
+        dataset_groups = dataset_groups[dataset_groups["Feature count"] > 0]
+        fig = go.Figure(go.Bar(x=dataset_groups["charge"].to_numpy(),
+                               y=dataset_groups["Feature count"].to_numpy(),
+                               marker_color=GraphConstants.primary_color))
+    else:
+        feature_mz_array = dataset['monoisotopic m/z'].to_numpy()
+        feature_rt_array = dataset['retention time'].to_numpy()
 
-    
-    if db_search is not None:
-        # initialize db search identification column as false
-        dataset.loc[:, 'db search identified'] = False
-
-        db_search_peptides = metapep_table_to_peptides(db_search)
-        db_search_mz_array = db_search_peptides['m/z'].to_numpy()
-        db_search_rt_array = db_search_peptides['RT'].to_numpy()
-        db_search_charge_array = db_search_peptides['Charge'].to_numpy()
-
-        matches = match_mz_rt_peaks(
-            db_search_mz_array,
-            feature_mz_array,
-            db_search_rt_array,
-            feature_rt_array,
-            db_search_charge_array,
-            feature_charge_array,
-            mz_cutoff,
-            rt_cutoff)
+        # boolean masks of features identified by db search or de novo
+        db_search_identified = np.zeros(dataset.shape[0], dtype=bool)
+        de_novo_identified = np.zeros(dataset.shape[0], dtype=bool)
         
-        # extract features with match, drop if feature assigned twice
-        feature_match_idx = np.unique([x[1] for x in matches])
+        if db_search is not None:
+            db_search_mz_array, db_search_rt_array, db_search_charge_array = \
+                peptide_mz_rt_charge_arrays(db_search)
+
+            _, feature_matches = match_mz_rt_peaks(
+                db_search_mz_array,
+                feature_mz_array,
+                db_search_rt_array,
+                feature_rt_array,
+                db_search_charge_array,
+                feature_charge_array,
+                mz_cutoff,
+                rt_cutoff)
+            
+            # extract features with match, drop if feature assigned twice
+            feature_match_idx = np.unique(feature_matches)
 
-        # set all identified indices as true
-        dataset.loc[dataset.index[feature_match_idx], 'db search identified'] = True
-    else:
-        dataset.loc[:, 'db search identified'] = np.nan
-    
-    if de_novo is not None:
-        # initialize db search identification column as false
-        dataset.loc[:, 'de novo identified'] = False
-
-        de_novo_peptides = metapep_table_to_peptides(de_novo)
-        de_novo_peptides = de_novo_peptides[de_novo_peptides["Confidence"] > de_novo_conf_cutoff]
-
-        de_novo_mz_array = de_novo_peptides['m/z'].to_numpy()
-        de_novo_rt_array = de_novo_peptides['RT'].to_numpy()
-        de_novo_charge_array = de_novo_peptides['Charge'].to_numpy()
-
-        matches = match_mz_rt_peaks(
-            feature_mz_array,
-            de_novo_mz_array,
-            feature_rt_array,
-            de_novo_rt_array,
-            feature_charge_array,
-            de_novo_charge_array,
-            mz_cutoff,
-            rt_cutoff)
+            # set all identified indices as true
+            db_search_identified[feature_match_idx] = True
         
-        # extract features with match, drop if feature assigned twice
-        feature_match_idx = np.unique([x[0] for x in matches])
+        if de_novo is not None:
+            de_novo_mz_array, de_novo_rt_array, de_novo_charge_array = \
+                peptide_mz_rt_charge_arrays(de_novo, de_novo_conf_cutoff)
+
+            feature_matches, _ = match_mz_rt_peaks(
+                feature_mz_array,
+                de_novo_mz_array,
+                feature_rt_array,
+                de_novo_rt_array,
+                feature_charge_array,
+                de_novo_charge_array,
+                mz_cutoff,
+                rt_cutoff)
+            
+            # extract features with match, drop if feature assigned twice
+            feature_match_idx = np.unique(feature_matches)
 
-        # set all identified indices as true
-        de_novo_conf_format = de_novo.confidence_format
-        dataset.loc[dataset.index[feature_match_idx], 'de novo identified'] = True
-    else:
-        de_novo_conf_format = None
-        dataset.loc[:, 'de novo identified'] = np.nan
-    
-    # categorize scans by db search, de novo or no identification
-    def partition_ident(row):
-        if row["db search identified"] is True:
-            return "db search"
-        elif row["de novo identified"] is True:
-            return "de novo only (> {} {})".format(de_novo_conf_cutoff, de_novo_conf_format)
+            # set all identified indices as true
+            de_novo_conf_format = de_novo.confidence_format
+            de_novo_identified[feature_match_idx] = True
         else:
-            return "unidentified"
-    dataset.loc[:, 'identification'] = dataset.apply(partition_ident, axis=1)
+            de_novo_conf_format = None
+
+        # categorize scans by db search, de novo or no identification
+        ident_cats = ["db search",
+                      "de novo only (> {} {})".format(de_novo_conf_cutoff, de_novo_conf_format),
+                      "unidentified"]
+        dataset['identification'] = pd.Categorical(
+            np.select([db_search_identified, de_novo_identified],
+                      ident_cats[:2],
+                      default=ident_cats[2]),
+            dtype=pd.CategoricalDtype(categories=ident_cats, ordered=True))
 
-    
-    if db_search is not None or de_novo is not None:
         # create bar groups
-        dataset_groups = dataset.groupby(by=["charge", "identification"]).size()
-        dataset_groups.name = "Feature count"
-        dataset_groups = dataset_groups.reset_index()
-
-        fig = px.bar(dataset_groups, 
-                     x="charge", 
-                     y="Feature count",
-                     color="identification", 
-                     color_discrete_sequence=GraphConstants.color_palette,
-                     category_orders={"identification": ["db search", 
-                                                         "de novo only (> {} {})".format(de_novo_conf_cutoff, de_novo_conf_format),
-                                                         "unidentified"],
-                                      "charge": charge_cats})
-    else:
-        dataset_groups = dataset.groupby(by="charge").size()
-        dataset_groups.name = "Feature count"
-        dataset_groups = dataset_groups.reset_index()
-        fig = px.bar(dataset_groups, 
-                     x="charge",
-                     y="Feature count",
-                     color_discrete_sequence=[GraphConstants.primary_color])
+        dataset_groups = dataset[["charge", "identification"]]\
+            .value_counts(sort=False)\
+            .sort_index()\
+            .reset_index(name="Feature count")
+        # drop unobserved combinations of categories
+        dataset_groups = dataset_groups[dataset_groups["Feature count"] > 0]
+
+        # one stacked bar trace per identification category, colors fixed by
+        # position in category order
+        palette = GraphConstants.color_palette
+        traces = []
+        for i, category in enumerate(ident_cats):
+            cat_groups = dataset_groups[dataset_groups["identification"] == category]
+            if cat_groups.shape[0] == 0:
+                continue
+            traces.append(go.Bar(x=cat_groups["charge"].to_numpy(),
+                                 y=cat_groups["Feature count"].to_numpy(),
+                                 name=category,
+                                 legendgroup=category,
+                                 marker_color=palette[i]))
+        fig = go.Figure(data=traces)
+        fig.update_layout(barmode="relative",
+                          legend=dict(title="identification"))
     
     fig.update_layout(margin=dict(l=20, r=20, t=10, b=10),
                       paper_bgcolor='rgba(0,0,0,0)',
                       plot_bgcolor='rgba(0,0,0,0)')
     fig.update_xaxes(title="Charge",
                      type="category", 
+                     categoryorder="array",
+                     categoryarray=charge_cats,
                      showline=True, 
                      linecolor="Black")
-    fig.update_yaxes(gridcolor=GraphConstants.gridcolor, 
+    fig.update_yaxes(title="Feature count",
+                     gridcolor=GraphConstants.gridcolor, 
                      gridwidth=GraphConstants.gridwidth)
     return fig
 
@@ -791,25 +784,42 @@ def ref_score_dist_plot(stat_dict: dict,
         sample_de_novo = None
     
     # fetch arrays
+    global_dist = stat_dict['global'][array_key]
+    mean_array = np.asarray(global_dist["mean"])
+    std_array = np.asarray(global_dist["std"])
     if normalize_scans is False and normalize_matches is False:
-        mean_array = np.array(stat_dict['global'][array_key]["mean"])
-        std_array =  np.array(stat_dict['global'][array_key]["std"])
-        xvals = list(range(len(mean_array)))
+        xvals = np.arange(len(mean_array))
     else:
-        mean_array = np.array(stat_dict['global'][array_key]["mean"])
-        std_array =  np.array(stat_dict['global'][array_key]["std"])
-        xvals = np.array(stat_dict['global'][array_key]["x vals"])
+        xvals = np.asarray(global_dist["x vals"])
     
     # return nothing if no data found in dict
     if len(mean_array) == 0:
         return
 
+    # downsample long distributions, bounds share the datapoints of the mean
+    if len(mean_array) > GraphConstants.max_line_points:
+        point_idx = lttb_downsample_indices(xvals,
+                                            mean_array,
+                                            GraphConstants.max_line_points)
+        xvals = xvals[point_idx]
+        mean_array = mean_array[point_idx]
+        std_array = std_array[point_idx]
+
     # add confidence interval
     fig.add_trace(go.Scatter(x=xvals, y=mean_array, name="mean", marker=dict(color="#444")))
     fig.add_trace(go.Scatter(x=xvals, y=mean_array + std_array, name="upper bound", marker=dict(color="#444"), line=dict(width=0), showlegend=False))
     fig.add_trace(go.Scatter(x=xvals, y=np.clip(mean_array - std_array, 0, None), name="lower bound", marker=dict(color="#444"), line=dict(width=0),
                             fillcolor='rgba(68, 68, 68, 0.3)', fill='tonexty', showlegend=False))
 
+    def add_sample_trace(x: np.ndarray, y: np.ndarray, name: str):
+        if len(y) > GraphConstants.max_line_points:
+            point_idx = lttb_downsample_indices(x, y, GraphConstants.max_line_points)
+            x, y = x[point_idx], y[point_idx]
+        fig.add_trace(go.Scatter(x=x,
+                                 y=y,
+                                 name=name,
+                                 marker=dict(color="red")))
+
     # overlay score distribution from sample
     if format == "db search" and sample_db_search is not None:
         if normalize_scans is True:
@@ -824,14 +834,11 @@ def ref_score_dist_plot(stat_dict: dict,
                 'Confidence'
             )
         else:
-            sorted_scores = fetch_sort_column(sample_db_search.data, "Confidence")
-            x = sorted_scores.index.to_numpy()
-            y = sorted_scores.values
+            # sort scores descending, negation keeps nan values at the end
+            y = -np.sort(-sample_db_search.data["Confidence"].to_numpy(dtype=float))
+            x = np.arange(y.shape[0])
 
-        fig.add_trace(go.Scatter(x=x,
-                                 y=y,
-                                 name="DB Search Import",
-                                 marker=dict(color="red")))
+        add_sample_trace(x, y, "DB Search Import")
     elif format == "de novo" and sample_de_novo is not None:
         if normalize_scans is True:
             y, x = pept_match_dist_normalize(
@@ -845,14 +852,11 @@ def ref_score_dist_plot(stat_dict: dict,
                 'Confidence'
             )
         else:
-            sorted_scores = fetch_sort_column(sample_de_novo.data, "Confidence")
-            x = sorted_scores.index.to_numpy()
-            y = sorted_scores.values
+            # sort scores descending, negation keeps nan values at the end
+            y = -np.sort(-sample_de_novo.data["Confidence"].to_numpy(dtype=float))
+            x = np.arange(y.shape[0])
 
-        fig.add_trace(go.Scatter(x=x,
-                                 y=y,
-                                 name="De Novo Import",
-                                 marker=dict(color="red")))
+        add_sample_trace(x, y, "De Novo Import")
 
     if normalize_scans is True:
         xtitle = "score n'th peptide match (% of MS2)"
@@ -865,9 +869,7 @@ def ref_score_dist_plot(stat_dict: dict,
                      gridcolor="rgba(0,0,0,0)", 
                      zerolinecolor="Black")
     fig.update_yaxes(title=score, 
-                     gridcolor=GraphConstants.gridcolor, 
-                     gridwidth=GraphConstants.gridwidth, 
-                     zerolinecolor="Black", 
+                     **GraphConstants.grid_axis_layout, 
                      nticks=6, 
                      rangemode='tozero')
     fig.update_layout(margin=dict(l=20, r=20, t=10, b=10),
@@ -885,13 +887,23 @@ def ref_score_threshold_plot(stat_dict: dict,
                              sample_db_search: MetaPepDbSearch | None=None,
                              sample_de_novo: MetaPepDeNovo | None=None,
                              spectral_metadata: dict | None=None):
-    db_search_score_unit = stat_dict['metadata']['db search confidence format']
-    de_novo_score_unit = stat_dict['metadata']['de novo confidence format']
+    ref_metadata = stat_dict['metadata']
+    db_search_score_unit = ref_metadata['db search confidence format']
+    de_novo_score_unit = ref_metadata['de novo confidence format']
     
     # Define group label dict, each format has a prefix and suffix
-    format_to_label = {"db search": [f"{db_search_score_unit}", ""],
-                       "de novo": [f"{de_novo_score_unit}", ""],
-                       "de novo only": [f"{de_novo_score_unit}", "d-only"]}
+    format_to_label = {"db search": [db_search_score_unit, ""],
+                       "de novo": [de_novo_score_unit, ""],
+                       "de novo only": [de_novo_score_unit, "d-only"]}
+
+    def threshold_labels(label_format: str, threshold_names: List) -> List[str]:
+        """Add prefix and suffix of the format to all threshold names."""
+        prefix, suffix = format_to_label[label_format]
+        return pd.Series(threshold_names, dtype=object)\
+            .astype(str)\
+            .radd(f"{prefix} ")\
+            .add(f" {suffix}")\
+            .tolist()
 
     # assert that stat dict is compatible with db search and de novo
     if sample_db_search is not None and\
@@ -916,6 +928,7 @@ def ref_score_threshold_plot(stat_dict: dict,
     # set order of categories (db search, de novo, de novo only)
     cat_order = merged_df["ident method"].unique()
 
+    box_traces, box_secondary_ys = [], []
     for category in cat_order:
         cat_data = merged_df[merged_df["ident method"] == category]
         
@@ -930,21 +943,25 @@ def ref_score_threshold_plot(stat_dict: dict,
         y_vals = cat_data['value'].to_numpy()
         name_vals = cat_data['sample'].to_numpy()
 
-        fig.add_trace(go.Box(x=x_vals,
-                             y=y_vals,
-                             text=name_vals,
-                             boxpoints='all',
-                             fillcolor='rgba(255,255,255,0)',
-                             line=dict(color='rgba(0,0,0,0)'),
-                             marker=dict(color=GraphConstants.color_palette[0]),
-                             pointpos=0,
-                             #whiskerwidth=0.2,
-                             marker_size=6,
-                             jitter=1,
-                             showlegend=False,
-                             #line_width=1,
-                             ),
-                    secondary_y=sec_y)
+        box_traces.append(go.Box(x=x_vals,
+                                 y=y_vals,
+                                 text=name_vals,
+                                 boxpoints='all',
+                                 fillcolor='rgba(255,255,255,0)',
+                                 line=dict(color='rgba(0,0,0,0)'),
+                                 marker=dict(color=GraphConstants.color_palette[0]),
+                                 pointpos=0,
+                                 #whiskerwidth=0.2,
+                                 marker_size=6,
+                                 jitter=1,
+                                 showlegend=False,
+                                 #line_width=1,
+                                 ))
+        box_secondary_ys.append(sec_y)
+    fig.add_traces(box_traces,
+                   rows=1,
+                   cols=1,
+                   secondary_ys=box_secondary_ys)
 
     # only process sample if normalization method possible or no normalization
     if not (spectral_metadata is None and any(x is True for x in [normalize_psm,
@@ -963,10 +980,9 @@ def ref_score_threshold_plot(stat_dict: dict,
             db_search_data = sample_db_search.data
             lgp_counts, lgp_names = count_threshold_values(db_search_data,
                                                            'Confidence',
-                                                           stat_dict['metadata']['db search thresholds'],
+                                                           ref_metadata['db search thresholds'],
                                                            div_factor=div_factor)
-            prefix, suffix = format_to_label["db search"]
-            lgp_names = [f"{prefix} {i} {suffix}" for i in lgp_names]
+            lgp_names = threshold_labels("db search", lgp_names)
             
             fig.add_trace(go.Scatter(
                 y=lgp_counts,
@@ -989,10 +1005,9 @@ def ref_score_threshold_plot(stat_dict: dict,
             de_novo_data = sample_de_novo.data
             alc_counts, alc_names = count_threshold_values(de_novo_data,
                                                            'Confidence',
-                                                           stat_dict['metadata']['de novo thresholds'],
+                                                           ref_metadata['de novo thresholds'],
                                                            div_factor=div_factor)
-            prefix, suffix = format_to_label["de novo"]
-            alc_names = [f"{prefix} {i} {suffix}" for i in alc_names]
+            alc_names = threshold_labels("de novo", alc_names)
         
         if sample_db_search is not None and sample_de_novo is not None \
             and "de novo only" in formats:
@@ -1000,10 +1015,9 @@ def ref_score_threshold_plot(stat_dict: dict,
         
             alc_only_counts, alc_only_names = count_threshold_values(sample_de_novo_only,
                                                                      'Confidence',
-                                                                     stat_dict['metadata']['de novo thresholds'],
+                                                                     ref_metadata['de novo thresholds'],
                                                                      div_factor=div_factor)
-            prefix, suffix = format_to_label["de novo only"]
-            alc_only_names = [f"{prefix} {i} {suffix}" for i in alc_only_names]
+            alc_only_names = threshold_labels("de novo only", alc_only_names)
         
         y_vals = (alc_counts + alc_only_counts)
         x_vals = (alc_names + alc_only_names)
@@ -1039,9 +1053,7 @@ def ref_score_threshold_plot(stat_dict: dict,
     fig.update_xaxes(gridcolor="rgba(0,0,0,0)", 
                      zerolinecolor="Black")
     fig.update_yaxes(title=lgp_y_name, 
-                     gridcolor=GraphConstants.gridcolor, 
-                     gridwidth=GraphConstants.gridwidth, 
-                    zerolinecolor="Black", nticks=6, 
+                     **GraphConstants.grid_axis_layout, nticks=6, 
                     rangemode='tozero')
     fig.update_yaxes(title=alc_y_name, 
                      showgrid=False, 
@@ -1064,22 +1076,18 @@ def ref_intensity_dist_plot(stat_dict: dict,
         else:
             raise ValueError("Invalid MS level given, only '1' or '2' supported") 
         
-        # store output in dict
-        ms_int_dict = dict()
-
-        # fetch data over samples
-        for name, data in data_dict["samples"].items():
-            ms_cats = data[key_field]["percentiles"]
-            ms_int = data[key_field]["values"]
-            
-            # add data to output dict
-            for cat, value in zip(ms_cats, ms_int):
-                if cat not in ms_int_dict.keys():
-                    ms_int_dict[cat] = [(name, value)]
-                else:
-                    ms_int_dict[cat].append((name, value))
-
-        return ms_int_dict
+        # fetch data over samples in long format
+        ms_int_frames = [pd.DataFrame({"sample": name,
+                                       "percentile": data[key_field]["percentiles"],
+                                       "value": data[key_field]["values"]})
+                         for name, data in data_dict["samples"].items()]
+        if len(ms_int_frames) == 0:
+            return dict()
+        ms_int_df = pd.concat(ms_int_frames, ignore_index=True)
+
+        # store sample names and values per percentile, in order of appearance
+        return {cat: (group["sample"].to_numpy(), group["value"].to_numpy())
+                for cat, group in ms_int_df.groupby("percentile", sort=False)}
 
     ms1_dict = compute_ms_int_dist(stat_dict, 1)
     ms2_dict = compute_ms_int_dist(stat_dict, 2)
@@ -1087,16 +1095,14 @@ def ref_intensity_dist_plot(stat_dict: dict,
     # if spectral data given, process percentiles of total ion current
     if spectral_data is not None:
         ref_percentiles = stat_dict['metadata']['intensity percentiles']
-        ms2_df = spectral_data[spectral_data["MS level"] == 2]
-        ms1_df = spectral_data[spectral_data["MS level"] == 1]
+        ms_levels = spectral_data["MS level"].to_numpy()
+        tic = spectral_data['total ion current'].to_numpy()
 
         # tuples: (perc. name, TIC value)
-        sample_ms2_tuple = array_to_percentiles(
-            ms2_df['total ion current'].to_numpy(),
-            ref_percentiles)
-        sample_ms1_tuple = array_to_percentiles(
-            ms1_df['total ion current'].to_numpy(),
-            ref_percentiles)
+        sample_ms2_tuple = array_to_percentiles(tic[ms_levels == 2],
+                                                ref_percentiles)
+        sample_ms1_tuple = array_to_percentiles(tic[ms_levels == 1],
+                                                ref_percentiles)
         
         sample_yvals = np.array(sample_ms1_tuple[0] + sample_ms2_tuple[0])
         sample_xvals = np.array(
@@ -1109,22 +1115,17 @@ def ref_intensity_dist_plot(stat_dict: dict,
     # create figure
     fig = go.Figure()
 
-
-    for key in ms1_dict.keys():
-            
-        xrow = []
-        yrow = []
-        name_row = []
+    traces = []
+    for key, (ms1_names, ms1_vals) in ms1_dict.items():
+        ms2_names, ms2_vals = ms2_dict[key]
         
-        names = [x[0] for x in ms1_dict[key] + ms2_dict[key]]
-        vals = [x[1] for x in ms1_dict[key] + ms2_dict[key]]
-        name_row += names
-        yrow += vals
-        xrow += [ms1_pref + key]*len(ms1_dict[key]) + \
-                [ms2_pref + key]*len(ms2_dict[key])
+        name_row = np.concatenate([ms1_names, ms2_names])
+        yrow = np.concatenate([ms1_vals, ms2_vals])
+        xrow = np.repeat([ms1_pref + key, ms2_pref + key],
+                         [len(ms1_names), len(ms2_names)])
         # yrow += ["MS1"]*len(ms1_dict[key]) + ["MS2"]*len(ms2_dict[key])
 
-        fig.add_trace(go.Box(y=yrow,
+        traces.append(go.Box(y=yrow,
                              x=xrow,
                              text=name_row,
                              boxpoints='all',
@@ -1156,7 +1157,7 @@ def ref_intensity_dist_plot(stat_dict: dict,
         #sample_xvals_perc = sample_xvals[sample_p == key]
         #sample_yvals_perc = sample_yvals[sample_p == key]
         
-        fig.add_trace(go.Scatter(
+        traces.append(go.Scatter(
             x=sample_xvals,
             y=sample_yvals,
             mode='markers',
@@ -1167,6 +1168,7 @@ def ref_intensity_dist_plot(stat_dict: dict,
             showlegend=True,
             name="Sample"
         ))
+    fig.add_traces(traces)
 
     x_order = [ms1_pref + key for key in ms1_dict.keys()] + \
               [ms2_pref + key for key in ms1_dict.keys()]
@@ -1200,21 +1202,28 @@ def ref_transmission_scatter_plot(stat_dict: dict,
     # create figure
     fig = go.Figure()
 
-    yrow = []
-    xrow = []
-    name_row = []
+    yrows, xrows, name_rows = [], [], []
 
     # based on injection time scale, get correct data
     stat_dict_param = "transmission loss" if scale_ion_injection_time is False\
         else "transmission loss ion injection time scaled"
 
     for name, data in stat_dict["samples"].items():
-        yrow += data[stat_dict_param]['values']
-        xrow += data[stat_dict_param]['percentiles']
-        name_row += [name]*len(data[stat_dict_param]['percentiles'])
+        percentiles = data[stat_dict_param]['percentiles']
+        yrows.append(np.asarray(data[stat_dict_param]['values'], dtype=float))
+        xrows.append(np.asarray(percentiles))
+        name_rows.append(np.full(len(percentiles), name))
+
+    yrow = np.concatenate(yrows) if len(yrows) > 0 else np.empty(0)
+    xrow = np.concatenate(xrows) if len(xrows) > 0 else np.empty(0)
+    name_row = np.concatenate(name_rows) if len(name_rows) > 0 else np.empty(0)
+
+    # convert transmission loss into transmission efficiency (%)
+    np.reciprocal(yrow, out=yrow)
+    yrow *= 100
 
     fig.add_trace(go.Box(
-        y=(1 / np.array(yrow))*100,
+        y=yrow,
         x=xrow,
         text=name_row,
         boxpoints='all',
@@ -1232,14 +1241,14 @@ def ref_transmission_scatter_plot(stat_dict: dict,
     ))
     
     if spectral_data is not None:
-        ms2_df = spectral_data[spectral_data["MS level"] == 2]
-        ms1_df = spectral_data[spectral_data["MS level"] == 1]
+        ms_levels = spectral_data["MS level"].to_numpy()
+        ms2_df = spectral_data.loc[ms_levels == 2]
         ref_percentiles = stat_dict['metadata']['intensity percentiles']
         
         if scale_ion_injection_time is True:
-            # get precursor ion injection time
+            # get precursor ion injection time, only then ms1 data is required
             prec_inj_time = fetch_precursor_ion_injection_time(
-                ms2_df, ms1_df
+                ms2_df, spectral_data.loc[ms_levels == 1]
             )
             sample_trm_loss = transmission_loss(ms2_df["precursor intensity"],
                                                 ms2_df["total ion current"],
@@ -1285,82 +1294,87 @@ def ref_transmission_scatter_plot(stat_dict: dict,
 
 def ref_miscleavage_dist_plot(stat_dict: dict,
                               db_search: MetaPepDbSearch | None) -> go.Figure:
-    # fetch miscleavage data from reference dataset
-    x_data, y_data,= defaultdict(list), defaultdict(list)
-
-    # get displayed samples for figure formatting purposes
-    ref_sample_number = 0
-    ref_samples = list()
+    # fetch miscleavage data from reference dataset in long format
+    miscleave_frames = [pd.DataFrame(columns=['sample', 'miscleavage', 'counts'])]
 
     for sample, data in stat_dict['samples'].items():
         miscleave_dist = data['miscleave dist']
-
-        # invert arrays to have least miscleavages at bottom
         miscleave_cats = miscleave_dist['miscleavage']
         counts = miscleave_dist['counts']
 
-        # calculate fractions
-        counts = np.array(counts) / np.sum(counts)
-
         # check that categories and counts are same size
         if len(miscleave_cats) != len(counts):
             print(f"miscleavage processing error: skip sample '{sample}'")
             continue
-        
-        if len(miscleave_cats) != 0:
-            ref_sample_number += 1
-            ref_samples.append(sample)
 
-        for i, category in enumerate(miscleave_cats):
-            x_data[category].append(sample)
-            y_data[category].append(counts[i])
+        miscleave_frames.append(pd.DataFrame({'sample': sample,
+                                              'miscleavage': miscleave_cats,
+                                              'counts': counts}))
+
+    miscleave_df = pd.concat(miscleave_frames, ignore_index=True)
+    
+    # calculate fractions
+    miscleave_df['fraction'] = miscleave_df['counts'].astype(float) / \
+        miscleave_df.groupby('sample')['counts'].transform('sum').astype(float)
+    
+    # get displayed samples for figure formatting purposes
+    ref_samples = pd.unique(miscleave_df['sample'])
+    ref_sample_number = len(ref_samples)
+
+    # categories as rows and samples as columns, both in order of appearance
+    fractions = miscleave_df.pivot(index='miscleavage',
+                                   columns='sample',
+                                   values='fraction')\
+        .reindex(index=pd.unique(miscleave_df['miscleavage']),
+                 columns=ref_samples)
     
 
-    # create horizontal barplot with two cols sharing the y-axis
-    ncols = 1 if db_search is None else 2
-    fig = make_subplots(rows=1,
-                        cols=ncols,
-                        specs=[[{}]*ncols],
-                        horizontal_spacing=0.05,
-                        shared_yaxes=True)
     color_generator = chain(GraphConstants.color_palette)
     color_map = defaultdict(color_generator.__next__)
-    
-    for category in x_data.keys():
-        fig.add_trace(
-            go.Bar(
-                name=category,
-                x=x_data[category],
-                y=y_data[category],
-                legendgroup=f"{category}",
-                marker_color=color_map[category]
-            ),
-            row=1,
-            col=ncols
-        )
 
-    # calculate miscleavage data for sample dataset
-    if db_search is not None:
+    def miscleavage_bar(category: str,
+                        x: np.ndarray | List[str],
+                        y: np.ndarray | List[float],
+                        showlegend: bool | None = None) -> go.Bar:
+        """Create bar trace of miscleavage category, colored by category."""
+        return go.Bar(name=category,
+                      x=x,
+                      y=y,
+                      legendgroup=f"{category}",
+                      showlegend=showlegend,
+                      marker_color=color_map[category])
+
+    ref_traces = []
+    for category, category_fractions in fractions.iterrows():
+        category_fractions = category_fractions.dropna()
+        ref_traces.append(miscleavage_bar(category,
+                                          category_fractions.index.to_numpy(),
+                                          category_fractions.to_numpy()))
+
+    if db_search is None:
+        # single plot with reference data only
+        fig = go.Figure()
+        fig.add_traces(ref_traces)
+        ref_subplot, sample_subplot = dict(), dict()
+    else:
+        # create horizontal barplot with two cols sharing the y-axis
+        fig = make_subplots(rows=1,
+                            cols=2,
+                            specs=[[{}]*2],
+                            horizontal_spacing=0.05,
+                            shared_yaxes=True)
+        fig.add_traces(ref_traces, rows=1, cols=2)
+        ref_subplot, sample_subplot = dict(row=1, col=2), dict(row=1, col=1)
+
+        # calculate miscleavage data for sample dataset
         sample_groups, sample_counts = calculate_miscleavages(db_search.data)
         sample_counts = np.array(sample_counts) / np.sum(sample_counts)
-        # sample = ["Sample"] * len(sample_counts)
-        for i, category in enumerate(sample_groups):
-            fig.add_trace(
-                go.Bar(
-                    name=category,
-                    x=["Sample"],
-                    y=[sample_counts[i]],
-                    legendgroup=f"{category}",
-                    showlegend=False,
-                    marker_color=color_map[category]
-                ),
-                row=1,
-                col=1
-            )
+        sample_traces = [miscleavage_bar(category, ["Sample"], [sample_counts[i]], False)
+                         for i, category in enumerate(sample_groups)]
+        fig.add_traces(sample_traces, rows=1, cols=1)
+
         # configure sample figure subplot
-        fig.update_yaxes(gridcolor=GraphConstants.gridcolor, 
-                         gridwidth=GraphConstants.gridwidth, 
-                         zerolinecolor="Black", 
+        fig.update_yaxes(**GraphConstants.grid_axis_layout, 
                          row=1,
                          col=1)
         
@@ -1382,29 +1396,27 @@ def ref_miscleavage_dist_plot(stat_dict: dict,
     
     fig.update_xaxes(gridcolor="rgba(0,0,0,0)",
                      zerolinecolor="Black",
-                     col=ncols,
-                     row=1,
-                     showticklabels=True)
+                     showticklabels=True,
+                     **ref_subplot)
 
-    fig.update_yaxes(gridcolor=GraphConstants.gridcolor, 
-        gridwidth=GraphConstants.gridwidth, 
-        zerolinecolor="Black",
-        row=1,
-        col=ncols)
+    fig.update_yaxes(**GraphConstants.grid_axis_layout,
+        **ref_subplot)
     fig.update_yaxes(title="DB search fraction", 
-                     col=1,
-                     row=1)
+                     **sample_subplot)
 
     # order samples from largest correclty cleaved fraction to smallest
-    sample_order = np.argsort(y_data['0'])[::-1]
-    samples_sorted = np.array(x_data['0'])[sample_order]
-    absent_samples = np.array([x for x in ref_samples if x not in samples_sorted])
+    if '0' in fractions.index:
+        cleaved_fractions = fractions.loc['0'].dropna()
+    else:
+        cleaved_fractions = pd.Series(dtype=float)
+    sample_order = np.argsort(cleaved_fractions.to_numpy())[::-1]
+    samples_sorted = cleaved_fractions.index.to_numpy()[sample_order]
+    absent_samples = ref_samples[~np.isin(ref_samples, samples_sorted)]
     samples_sorted = np.hstack([samples_sorted, absent_samples])
 
     fig.update_xaxes(categoryorder='array',
                      categoryarray=samples_sorted,
-                     row=1,
-                     col=ncols)
+                     **ref_subplot)
 
     fig.update_layout(margin=dict(l=20, r=20, t=10, b=10),
                       paper_bgcolor='rgba(0,0,0,0)',
@@ -1441,8 +1453,18 @@ def ref_score_metrics_barplot(stat_dict: dict,
                    "# DB search matches",
                    "# De novo identifications"]
     
-    # initial order of samples is just order in json file
-    cats = list(stat_dict["samples"].keys())
+    # collect reference metrics in a single table, samples as rows
+    metric_fields = ["total rt",
+                     "ms1 count",
+                     "ms2 count",
+                     "db search matches",
+                     "de novo matches"]
+    sample_metrics = pd.DataFrame.from_dict(
+        {sample_name: [sample_data[field] for field in metric_fields]
+         for sample_name, sample_data in stat_dict["samples"].items()},
+        orient="index",
+        columns=metric_fields)
+    sample_names = sample_metrics.index.to_numpy()
 
     fig = make_subplots(rows=1,
                         cols=ncols,
@@ -1462,25 +1484,24 @@ def ref_score_metrics_barplot(stat_dict: dict,
         sample_values[4] = sample_db_search.data.shape[0]
     if sample_de_novo is not None:
         sample_values[5] = sample_de_novo.data.shape[0]
+    # only draw sample values that are present
+    sample_values_finite = np.isfinite(np.asarray(sample_values, dtype=float))
 
+    sample_line_style = dict(width=3,
+                             color=GraphConstants.color_palette[2],
+                             dash="dash")
+    sample_lines = []
     for n in range(ncols):
         plot_title = plot_titles[n]
         data_field = dict_fields[n]
         axis_title = axis_titles[n]
 
-        sample_names = []
-        values = []
-
-        for sample_name, sample_data in stat_dict["samples"].items():
-            sample_names.append(sample_name)
-
-            if isinstance(data_field, str):
-                values.append(sample_data[data_field])
-            # if two fields supplied, divide first value with second
-            else:
-                values.append(
-                    sample_data[data_field[0]] / sample_data[data_field[1]]
-                )
+        if isinstance(data_field, str):
+            values = sample_metrics[data_field].to_numpy()
+        # if two fields supplied, divide first value with second
+        else:
+            values = (sample_metrics[data_field[0]] / \
+                      sample_metrics[data_field[1]]).to_numpy()
 
         fig.add_trace(
             go.Bar(x=values,
@@ -1495,31 +1516,27 @@ def ref_score_metrics_barplot(stat_dict: dict,
                          row=1,
                          title=axis_title)
         
-        # add sample value as line
-        if sample_values[n] == sample_values[n]:
-            fig.add_vline(type="line",
-                          x=sample_values[n],
-                          # x1=sample_values[n],
-                          #y0=0, y1=10, 
-                          # yref="paper",
-                          line=dict(
-                              width=3,
-                              color=GraphConstants.color_palette[2],
-                              dash="dash",
-                          ),
-                          # annotation_text=f"Imported sample",
-                          # annotation_position="bottom right",
-                          col=n+1,
-                          row=1
-            )
-
-        # order samples by db search matching score
-        if data_field == "db search matches":
-            cats_order = np.array(values).argsort()
-            cats = list(np.array(sample_names)[cats_order])
+        # add sample value as line spanning the subplot height
+        if sample_values_finite[n]:
+            axis_suffix = "" if n == 0 else n + 1
+            sample_lines.append(dict(type="line",
+                                     x0=sample_values[n],
+                                     x1=sample_values[n],
+                                     xref=f"x{axis_suffix}",
+                                     y0=0,
+                                     y1=1,
+                                     yref=f"y{axis_suffix} domain",
+                                     line=sample_line_style))
+
+    if len(sample_lines) > 0:
+        fig.update_layout(shapes=sample_lines)
+
+    # order samples by db search matching score
+    cats_order = sample_metrics["db search matches"].to_numpy().argsort()
+    cats = sample_names[cats_order].tolist()
 
     # Create empty trace to have annotation for the legend if sample imported
-    if any(x == x for x in sample_values):
+    if sample_values_finite.any():
         fig.add_trace(
             dict(
                 type="scatter",
@@ -1539,10 +1556,7 @@ def ref_score_metrics_barplot(stat_dict: dict,
                      categoryorder='array',
                      categoryarray=cats)
     
-    fig.update_xaxes(gridcolor=GraphConstants.gridcolor, 
-                     gridwidth=GraphConstants.gridwidth,
-                     
-                     zerolinecolor="Black",
+    fig.update_xaxes(**GraphConstants.grid_axis_layout,
                      nticks=6)
     
     fig.update_layout(margin=dict(l=20, r=20, t=30, b=0),
@@ -1562,15 +1576,16 @@ def ref_score_threshold_barplot(stat_dict: dict,
                                 sample_db_search: MetaPepDbSearch | None=None,
                                 sample_de_novo: MetaPepDeNovo | None=None,
                                 spectral_metadata: dict | None=None):
-    db_search_score_unit = stat_dict['metadata']['db search confidence format']
-    de_novo_score_unit = stat_dict['metadata']['de novo confidence format']
+    ref_metadata = stat_dict['metadata']
+    db_search_score_unit = ref_metadata['db search confidence format']
+    de_novo_score_unit = ref_metadata['de novo confidence format']
     de_novo_ident_group = "de novo only confidence dist" if filter_de_novo_only is True\
         else "de novo confidence dist"
     
     # Define group label dict, each format has a prefix and suffix
-    format_to_label = {"db search": [f"{db_search_score_unit}", ""],
-                       "de novo": [f"{de_novo_score_unit}", ""],
-                       "de novo only": [f"{de_novo_score_unit}", "d-only"]}
+    format_to_label = {"db search": [db_search_score_unit, ""],
+                       "de novo": [de_novo_score_unit, ""],
+                       "de novo only": [de_novo_score_unit, "d-only"]}
     
     # assert that stat dict is compatible with db search and de novo
     if sample_db_search is not None and\
@@ -1587,6 +1602,10 @@ def ref_score_threshold_barplot(stat_dict: dict,
         normalize_psm,
         normalize_rt,
         normalize_fill)
+
+    # group and compare label columns on category codes
+    for label_col in ["ident method", "x axis", "sample"]:
+        merged_df[label_col] = merged_df[label_col].astype("category")
     
     # only display sample if data is present for visualization options
     if all(x is None for x in [sample_db_search, sample_de_novo]):
@@ -1610,9 +1629,8 @@ def ref_score_threshold_barplot(stat_dict: dict,
                         horizontal_spacing=0.05,
                         shared_yaxes=True)
 
-    # match category to bar column
-    cat_to_col = dict()
-    color_generator = chain(GraphConstants.color_palette)
+    # match category to bar column, repeat palette if categories exceed colors
+    cat_to_col = defaultdict(cycle(GraphConstants.color_palette).__next__)
     def add_traces(fig: go.Figure,
                    dataset: pd.DataFrame,
                    col: int,
@@ -1630,44 +1648,40 @@ def ref_score_threshold_barplot(stat_dict: dict,
         Returns:
             go.Figure: Updated plotly graph object
         """
-        # sort data to obtain best-to-worst distribution in figure
-        db_search_data = dataset[dataset["ident method"] == "db search confidence dist"]\
-            .sort_values(by="value", ascending=False)
-        de_novo_data =  dataset[dataset["ident method"] == de_novo_ident_group]
-        
-
-        # add barplot traces for one dataset
-        for groupname, groupdata in db_search_data.groupby("x axis"):
-            if f"{groupname}" not in cat_to_col:
-                cat_to_col[f"{groupname}"] = color_generator.__next__()
-
-            fig.add_trace(
-                go.Bar(
-                    name=groupname,
-                    x=groupdata["sample"],
-                    y=groupdata["value"],
-                    marker=dict(color=cat_to_col[f"{groupname}"]),
-                    legendgroup=f"{groupname}",
-                    showlegend=show_legend
-                    ),
-                row=1,
-                col=col)
-
-
-        for groupname, groupdata in de_novo_data.groupby("x axis"):
-            if f"{groupname}" not in cat_to_col:
-                cat_to_col[f"{groupname}"] = color_generator.__next__()
-            fig.add_trace(
-                go.Bar(
-                    name=groupname,
-                    x=groupdata["sample"],
-                    y=groupdata["value"],
-                    marker=dict(color=cat_to_col[f"{groupname}"]),
-                    legendgroup=f"{groupname}",
-                    showlegend=show_legend
-                    ),
-                row=2,
-                col=col)
+        # split data by identification method, db search on top row
+        ident_groups = dict(tuple(dataset.groupby("ident method",
+                                                  sort=False,
+                                                  observed=True)))
+        ident_rows = [("db search confidence dist", 1),
+                      (de_novo_ident_group, 2)]
+
+        # add barplot traces per threshold category, in order of thresholds
+        traces, trace_rows = [], []
+        for ident_method, row in ident_rows:
+            if ident_method not in ident_groups:
+                continue
+            ident_data = ident_groups[ident_method]
+
+            for groupname, groupdata in ident_data.groupby("x axis",
+                                                           sort=False,
+                                                           observed=True):
+                # sort db search data to obtain best-to-worst distribution in figure
+                if row == 1:
+                    groupdata = groupdata.sort_values(by="value",
+                                                      ascending=False,
+                                                      kind="stable")
+
+                traces.append(
+                    go.Bar(
+                        name=groupname,
+                        x=groupdata["sample"].to_numpy(),
+                        y=groupdata["value"].to_numpy(),
+                        marker=dict(color=cat_to_col[groupname]),
+                        legendgroup=groupname,
+                        showlegend=show_legend
+                        ))
+                trace_rows.append(row)
+        fig.add_traces(traces, rows=trace_rows, cols=[col]*len(traces))
         return fig
 
     fig = add_traces(fig, merged_df, ncols, True)
@@ -1685,23 +1699,14 @@ def ref_score_threshold_barplot(stat_dict: dict,
                                                  ms2_num,
                                                  total_rt,
                                                  formats,
-                                                 stat_dict['metadata']['db search thresholds'],
-                                                 stat_dict['metadata']['de novo thresholds'],
+                                                 ref_metadata['db search thresholds'],
+                                                 ref_metadata['de novo thresholds'],
                                                  normalize_psm,
                                                  normalize_rt,
                                                  normalize_fill)
         fig = add_traces(fig, sample_data, 1, False)
         
         # configure sample figure subplot
-        fig.update_yaxes(gridcolor=GraphConstants.gridcolor, 
-            gridwidth=GraphConstants.gridwidth, 
-            zerolinecolor="Black",
-            domain=[0.3, 1], row=1, col=1)
-        fig.update_yaxes(gridcolor=GraphConstants.gridcolor, 
-            gridwidth=GraphConstants.gridwidth, 
-            showline=False,
-            autorange="reversed", 
-            domain=[0, 0.3], row=2, col=1)
         fig.update_xaxes(row=1, 
                          col=1, 
                          showticklabels=True,
@@ -1713,15 +1718,13 @@ def ref_score_threshold_barplot(stat_dict: dict,
                          showticklabels=False)
         
         # set domain based on number of datapoints
-        ref_sample_num = len(merged_df["sample"].unique())
+        ref_sample_num = len(merged_df["sample"].cat.categories)
         sample_range = max(1 / (ref_sample_num + 1), 0.02)
         
-        fig.update_xaxes(domain=[0, sample_range], row=1, col=1)
-        fig.update_xaxes(domain=[0, sample_range], row=2, col=1)
-        fig.update_xaxes(domain=[sample_range + 0.02, 1], row=1, col=2)
-        fig.update_xaxes(domain=[sample_range + 0.02, 1], row=2, col=2)
+        fig.update_xaxes(domain=[0, sample_range], col=1)
+        fig.update_xaxes(domain=[sample_range + 0.02, 1], col=2)
         
-    num_samples = stat_dict['metadata']['sample size']
+    num_samples = ref_metadata['sample size']
     fig.update_xaxes(gridcolor="rgba(0,0,0,0)",
                      zerolinecolor="Black", 
                      showticklabels=False if num_samples > 20 else True,
@@ -1729,19 +1732,16 @@ def ref_score_threshold_barplot(stat_dict: dict,
                      row=2)
     fig.update_xaxes(showticklabels=False, col=ncols, row=1)
 
-    fig.update_yaxes(gridcolor=GraphConstants.gridcolor, 
-        gridwidth=GraphConstants.gridwidth, 
-        zerolinecolor="Black",
+    # db search and de novo rows, shared by sample and reference columns
+    fig.update_yaxes(**GraphConstants.grid_axis_layout,
         domain=[0.3, 1], 
-        row=1, 
-        col=ncols)
+        row=1)
     fig.update_yaxes(gridcolor=GraphConstants.gridcolor, 
         gridwidth=GraphConstants.gridwidth, 
         showline=False,
         autorange="reversed", 
         domain=[0, 0.3],# tickvals=tickvals,
-        row=2, 
-        col=ncols)
+        row=2)
     
 
     fig.update_yaxes(title="DB Search", row=1, col=1)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Any
+import numpy as np
 from metapepview.backend import DbSearchSource, DeNovoSource
 from dataclasses import dataclass
 
@@ -25,7 +26,63 @@ de_novo_file_name: Dict[DeNovoSource, str] = {
 }
 
 
-@dataclass
+# file fields stored for each source file in the file location dictionary
+source_file_fields = ("raw", "db search", "de novo", "mzxml", "mzml",
+                      "db search obj", "de novo obj")
+
+# empty sample entry of the reference dataset, metrics without data remain
+# at their default (nan or empty) values. Copy before use.
+sample_output_template: Dict[str, Any] = {
+    'timestamp': np.nan,
+    'ms1 count': np.nan,
+    'ms2 count': np.nan,
+    'total rt': np.nan,
+    'mean pept len': np.nan,
+    'de novo mean pept len': np.nan,
+    'mean mass': np.nan,
+    'de novo mean mass': np.nan,
+    'db search matches': np.nan,
+    'de novo matches': np.nan,
+    'de novo confidence dist' : {
+        'thresholds': [],
+        'counts': []
+    },
+    'db search confidence dist' : {
+        'thresholds': [],
+        'counts': []
+    },
+    'de novo only confidence dist': {
+        'thresholds': [],
+        'counts': []
+    },
+    'charge dist': {
+        'charge': [],
+        'counts': []
+    },
+    'miscleave dist': {
+        'miscleavage': [],
+        'counts': []
+    },
+    'ms1 intensity': {
+        'percentiles': [],
+        'values': []
+    },
+    'ms2 intensity': {
+        'percentiles': [],
+        'values': []
+    },
+    'transmission loss': {
+        'percentiles': [],
+        'values': []
+    },
+    'transmission loss ion injection time scaled': {
+        'percentiles': [],
+        'values': []
+    },
+}
+
+
+@dataclass(slots=True, frozen=True)
 class RefBuilderOptions():
     root_dir: Path
     db_search_format: DbSearchSource
@@ -1,8 +1,14 @@
 # ms functions
 from __future__ import annotations
 
+import re
+import copy
+import fnmatch
 from typing import List, Dict, Any
 from pathlib import Path
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import xml.etree.ElementTree as ET
 import pandas as pd
 
 from metapepview.backend.type_operations import * # load_metapep_db_search, load_metapep_de_novo, db_search_importers, de_novo_importers
@@ -12,7 +18,7 @@ from metapepview.backend.spectral_ref_builder.utils import *
 from metapepview.backend.spectral_ref_builder.definitions import *  
 
 
-def fetch_file_locations(options: RefBuilderOptions) -> Dict[str, Dict[str, Path | None]]:
+def fetch_file_locations(options: RefBuilderOptions) -> Dict[str, Dict[str, Any]]:
     """Parse supplied parent dictionary and fetch all files that adhere to the
     data formats of interest. From the collected files, build a mapping dataset
     that maps raw file names to spectral data and metaproteomics output data.
@@ -31,45 +37,75 @@ def fetch_file_locations(options: RefBuilderOptions) -> Dict[str, Dict[str, Path
         options (RefBuilderOptions): Reference dataset builder options.
 
     Returns:
-        Dict[str, Dict[str, Path | None]]: Mapping dataset matching raw file name
-            to spectral and metaproteomics output files.
+        Dict[str, Dict[str, Any]]: Mapping dataset matching raw file name
+            to spectral and metaproteomics output files. Parsed identification
+            files are stored under the 'db search obj' and 'de novo obj' keys.
     """
-    # fetch all raw files, db search files and de novo files
-    root_dir = options.root_dir
-    raw_files = list(root_dir.rglob("*.raw"))
-    mzxml_files = root_dir.rglob("*.mzXML")
-    mzml_files = root_dir.rglob("*.mzML")
-    db_search_files = root_dir.rglob(options.db_search_file_pattern)
-    de_novo_files = root_dir.rglob(options.de_novo_file_pattern)
+    # fetch all raw files, db search files and de novo files in a single
+    # walk over the directory tree, file name patterns are compiled once
+    file_patterns = {"raw": "*.raw",
+                     "mzxml": "*.mzXML",
+                     "mzml": "*.mzML",
+                     "db search": options.db_search_file_pattern,
+                     "de novo": options.de_novo_file_pattern}
+    file_regexes = {filetype: re.compile(fnmatch.translate(pattern))
+                    for filetype, pattern in file_patterns.items()}
+    found_files = {filetype: [] for filetype in file_patterns.keys()}
+    for entry in iterate_directory_files(options.root_dir):
+        for filetype, regex in file_regexes.items():
+            if regex.match(entry.name):
+                found_files[filetype].append(Path(entry.path))
+    
+    raw_files = found_files["raw"]
+    mzxml_files = found_files["mzxml"]
+    mzml_files = found_files["mzml"]
+    db_search_files = found_files["db search"]
+    de_novo_files = found_files["de novo"]
 
     # create dict that combines raw files with db search and denovo files
-    output_dict = {key.stem: {"raw": key,
-                              "db search": None, 
-                              "de novo": None,
-                              "mzxml": None,
-                              "mzml": None} for key in raw_files}
+    output_dict = {key.stem: {**dict.fromkeys(source_file_fields), "raw": key}
+                   for key in raw_files}
     
     # parse file lists and update dict
-    for mzxml_path in mzxml_files:
-        source_names = [mzxml_path.stem]
-        output_dict = add_to_source_dict(output_dict, source_names, mzxml_path, "mzxml")
-    for mzml_path in mzml_files:
-        source_names = [mzml_path.stem]
-        output_dict = add_to_source_dict(output_dict, source_names, mzml_path, "mzml")
-    for db_search_path in db_search_files:
-        source_names = ident_file_source(db_search_path, "db search", options)
-        output_dict = add_to_source_dict(output_dict, source_names, db_search_path, "db search")
-    for de_novo_path in de_novo_files:
-        source_names = ident_file_source(de_novo_path, "de novo", options)
-        output_dict = add_to_source_dict(output_dict, source_names, de_novo_path, "de novo")
+    output_dict = add_many_to_source_dict(
+        output_dict,
+        (([mzxml_path.stem], mzxml_path, None) for mzxml_path in mzxml_files),
+        "mzxml")
+    output_dict = add_many_to_source_dict(
+        output_dict,
+        (([mzml_path.stem], mzml_path, None) for mzml_path in mzml_files),
+        "mzml")
+    # identification files are parsed to fetch their source files, store the
+    # parsed objects to prevent reading them again when building the dataset.
+    # Files are read concurrently, csv parsing largely releases the GIL.
+    with ThreadPoolExecutor() as executor:
+        db_search_objs = executor.map(
+            partial(read_ident_file, filetype="db search", options=options),
+            db_search_files)
+        de_novo_objs = executor.map(
+            partial(read_ident_file, filetype="de novo", options=options),
+            de_novo_files)
+        db_search_objs, de_novo_objs = list(db_search_objs), list(de_novo_objs)
+    
+    output_dict = add_many_to_source_dict(
+        output_dict,
+        ((obj.get_source_files(), path, obj)
+         for path, obj in zip(db_search_files, db_search_objs)),
+        "db search")
+    output_dict = add_many_to_source_dict(
+        output_dict,
+        ((obj.get_source_files(), path, obj)
+         for path, obj in zip(de_novo_files, de_novo_objs)),
+        "de novo")
 
     
     return output_dict
 
 
 def build_spectral_reference_data(
-    file_loc_dict: Dict[str, Dict[str, Path | None]],
-    options: RefBuilderOptions) -> Dict[str, Dict[str, Any]]:
+    file_loc_dict: Dict[str, Dict[str, Any]],
+    options: RefBuilderOptions,
+    processes: int | None = None) -> Dict[str, Dict[str, Any]]:
     """Fetch relevant data from large dataset of raw spectral files and
     (meta)proteomics (db search + de novo) files and combine them in a json
     formatted reference dataset containing key metrics across a large set of
@@ -78,7 +114,7 @@ def build_spectral_reference_data(
     for visualization.
 
     Args:
-        file_loc_dict (Dict[str, Dict[Path | None]]): Dictionary of file locations
+        file_loc_dict (Dict[str, Dict[str, Any]]): Dictionary of file locations
             (raw data, db search and de novo) grouped by analyzed sample.
         db_search_threhsholds (List[int | float]): List of threshold values that
             partition db search rows into groups by confidence.
@@ -86,11 +122,16 @@ def build_spectral_reference_data(
             partition de novo rows into groups by confidence.
         intensity_percentiles (List[int | float]): List of percentile thresholds
             that partition scan rows by intensity.
+        processes (int | None, optional): Number of worker processes used to
+            process samples in parallel. If None, the number of CPUs is used.
+            Defaults to None.
 
     Returns:
         Dict[str, Dict[str, Any]]: Dataset of key metrics grouped by experiment
-            extracted from the input datasets. The output dataset is written in
-            the following convention:
+            extracted from the input datasets. Global distribution values are
+            stored as numpy arrays, these are converted when writing the
+            dataset to json. The output dataset is written in the following
+            convention:
 
             {
                 "metadata": {
@@ -258,246 +299,49 @@ def build_spectral_reference_data(
         'Confidence')
     
     statistics_dict['global']['db search confidence dist'] = {
-        'mean': db_search_conf_mean.tolist(),
-        'std': db_search_conf_std.tolist()
+        'mean': db_search_conf_mean,
+        'std': db_search_conf_std
     }
     statistics_dict['global']['de novo confidence dist'] = {
-        'mean': de_novo_conf_mean.tolist(),
-        'std': de_novo_conf_std.tolist()
+        'mean': de_novo_conf_mean,
+        'std': de_novo_conf_std
     }
     statistics_dict['global']['db search confidence dist norm'] = {
-        'mean': db_search_norm_mean.tolist(),
-        'std': db_search_norm_std.tolist(),
-        'x vals': db_search_norm_x_vals.tolist()
+        'mean': db_search_norm_mean,
+        'std': db_search_norm_std,
+        'x vals': db_search_norm_x_vals
     }
     statistics_dict['global']['de novo confidence dist norm'] = {
-        'mean': de_novo_norm_mean.tolist(),
-        'std': de_novo_norm_std.tolist(),
-        'x vals': de_novo_norm_x_vals.tolist()
+        'mean': de_novo_norm_mean,
+        'std': de_novo_norm_std,
+        'x vals': de_novo_norm_x_vals
     }
 
-    # counter
-    c = 0
-    # parse each file separately to compute sample specific statistics
-    for name, data in file_loc_dict.items():
-        # initialize empty sample field
-        sample_output = {
-            'timestamp': np.nan,
-            'ms1 count': np.nan,
-            'ms2 count': np.nan,
-            'total rt': np.nan,
-            'mean pept len': np.nan,
-            'de novo mean pept len': np.nan,
-            'mean mass': np.nan,
-            'de novo mean mass': np.nan,
-            'db search matches': np.nan,
-            'de novo matches': np.nan,
-            'de novo confidence dist' : {
-                'thresholds': [],
-                'counts': []
-            },
-            'db search confidence dist' : {
-                'thresholds': [],
-                'counts': []
-            },
-            'de novo only confidence dist': {
-                'thresholds': [],
-                'counts': []
-            },
-            'charge dist': {
-                'charge': [],
-                'counts': []
-            },
-            'miscleave dist': {
-                'miscleavage': [],
-                'counts': []
-            },
-            'ms1 intensity': {
-                'percentiles': [],
-                'values': []
-            },
-            'ms2 intensity': {
-                'percentiles': [],
-                'values': []
-            },
-            'transmission loss': {
-                'percentiles': [],
-                'values': []
-            },
-            'transmission loss ion injection time scaled': {
-                'percentiles': [],
-                'values': []
-            },
-        }
-        # Open psm and de novo datasets, if they exist
-        if data["db search"] is None:
-            db_search, db_search_data = None, None
-        else:
-            db_search = load_metapep_db_search(data["db search"], 
-                                               name, 
-                                               options.db_search_format)
-            # if file contains data from other source files, omit them
-            if len(db_search.source_files) > 1:
-                db_search = db_search.filter_spectral_name(name)
-            db_search_data = db_search.data
-            
-        if data["de novo"] is None:
-            de_novo, de_novo_data = None, None
-        else:
-            de_novo = load_metapep_de_novo(data['de novo'],
-                                           name,
-                                           options.de_novo_format)
-            if len(de_novo.source_files) > 1:
-                de_novo = de_novo.filter_spectral_name(name)
-            de_novo_data = de_novo.data
-        
-        # wrangle datasets
-        # fetch data from db search
-        if db_search_data is not None:
-            sample_output['mean pept len'] = db_search_data['Sequence'].apply(len).mean()
-            sample_output['mean mass'] = db_search_data['Mass'].mean()
-            sample_output['db search matches'] = db_search_data.shape[0]
-            db_search_thres_counts, db_search_thres_names = count_threshold_values(
-                db_search_data,
-                "Confidence",
-                options.db_search_thresholds
-            )
-            sample_output['db search confidence dist'] = {
-                'thresholds': db_search_thres_names,
-                'counts': db_search_thres_counts
-            }
-
-            # add miscleavage distribution to sample
-            miscleave_groups, miscleave_counts = calculate_miscleavages(db_search_data)
-            sample_output['miscleave dist'] = {
-                'miscleavage': miscleave_groups,
-                'counts': list(miscleave_counts)
-            }
-
-        # fetch data from de novo
-        if de_novo_data is not None:
-            sample_output['de novo mean pept len'] = de_novo_data['Sequence']\
-                .apply(len)\
-                .mean()
-            sample_output['de novo mean mass'] = de_novo_data['Mass'].mean()
-            sample_output['de novo matches'] = de_novo_data.shape[0]
-            de_novo_thres_counts, de_novo_thres_names = count_threshold_values(
-                de_novo_data,
-                "Confidence",
-                options.de_novo_thresholds)
-            sample_output['de novo confidence dist'] = {'thresholds': de_novo_thres_names,
-                                         'counts': de_novo_thres_counts}
-        
-        # fetch de novo only, which requires both de novo and db search
-        if de_novo is not None and db_search is not None:
-            de_novo_only = de_novo.filter_de_novo_only(db_search)
-            de_novo_only_counts, de_novo_only_names = count_threshold_values(
-                de_novo_only.data,
-                "Confidence",
-                options.de_novo_thresholds
-                )
-            sample_output['de novo only confidence dist'] = {
-                'thresholds': de_novo_only_names,
-                'counts': de_novo_only_counts
-            }
-        
-
-        # fetch spectral information from mzml file
-        spectral = data["mzml"]
-        # fetch spectral data from mzxml file
-        if spectral is not None:
-            mzml_fields = ['scan number', 'MS level',
-                           'peaks count', 'retention time', 'total ion current', 
-                           'precursor charge', 'precursor intensity', 
-                           'ion injection time', 'precursor scan number']
-            
-            print(c, spectral)
-            c += 1
-            
-            try:
-                mzml_df, mzml_metadata = mzml_to_df(open(spectral, 'rb'),
-                                                    fields=mzml_fields)
-            except:
-                print("failed to read mzml file.")
-                mzml_df = None
-                
-            if mzml_df is not None and mzml_df.shape[0] > 0: 
-                sample_output['timestamp'] = mzml_metadata['timestamp']
-                # make complete dataframe numeric
-                mzml_df = mzml_df.apply(pd.to_numeric, axis=0)
-                
-                # obtain statistics from mzxml file
-                # mslevel_idx = mzxml_fields.index()
-                ms2_df = mzml_df[mzml_df['MS level'] == 2]
-                ms1_df = mzml_df[mzml_df['MS level'] == 1]
-                sample_output['ms2 count'] = ms2_df.shape[0]
-                sample_output['ms1 count'] = ms1_df.shape[0]
-                
-                sample_output['total rt'] = mzml_df.at[mzml_df.index[-1],
-                                                       'retention time']
-                
-                
-                # compute ms2 intensities at median and top percentiles
-                ms2_int_vals, ms2_int_names = scan_intensity_percentiles(ms2_df,
-                                                                         'total ion current',
-                                                                         options.intensity_percentiles)
-                ms1_int_vals, ms1_int_names = scan_intensity_percentiles(ms1_df,
-                                                                         'total ion current',
-                                                                         options.intensity_percentiles)
-                sample_output['ms2 intensity'] = {'percentiles': ms2_int_names,
-                                                  'values': ms2_int_vals}
-                sample_output['ms1 intensity'] = {'percentiles': ms1_int_names,
-                                                  'values': ms1_int_vals}
-
-                # compute transmission losses, only if ms2 spectra present
-                if ms2_df.shape[0] == 0:
-                    sample_output['transmission loss'] = {
-                        'percentiles': ms2_int_names,
-                        'values': [np.nan, np.nan, np.nan]}
-                    sample_output['transmission loss ion injection time scaled'] = {
-                        'percentiles': ms2_int_names,
-                        'values': [np.nan, np.nan, np.nan]}
-                else:
-                    # fetch precursor ion injection time
-                    prec_inj_time = fetch_precursor_ion_injection_time(
-                        ms2_df, ms1_df
-                    )
-
-                    # compute transmission losses (ion injection time scaled and unscaled)
-                    trm_loss_ion_inj = transmission_loss(ms2_df['precursor intensity'],
-                                                         ms2_df['total ion current'],
-                                                         prec_inj_time,
-                                                         ms2_df['ion injection time'])
-                    trm_loss = transmission_loss(ms2_df['precursor intensity'],
-                                                ms2_df['total ion current'])
-
-                    # compute percentiles for both
-                    trm_loss_ion_inj_vals, trm_loss_ion_inj_names = array_to_percentiles(
-                        trm_loss_ion_inj.to_numpy(),
-                        options.transmission_loss_percentiles,
-                        True)
-                    trm_loss_vals, trm_loss_names = array_to_percentiles(
-                        trm_loss.to_numpy(),
-                        options.transmission_loss_percentiles,
-                        True)
-                    
-                    # store both in output dataset
-                    sample_output['transmission loss'] = {
-                        'percentiles': trm_loss_names,
-                        'values': trm_loss_vals}
-                    sample_output['transmission loss ion injection time scaled'] = {
-                        'percentiles': trm_loss_ion_inj_names,
-                        'values': trm_loss_ion_inj_vals}
-            
-                # count occurrences of each charge
-                charges, counts = np.unique(ms2_df.loc[:, 'precursor charge'].to_numpy(),
-                                            return_counts=True)
-                # grab indices of charges sorted, to sort both lists in output
-                idx_sort = np.argsort(charges)
-                sample_output['charge dist'] = {'charge': charges.astype(str)[idx_sort].tolist(),
-                                                'counts': counts[idx_sort].tolist()}
-        
-        statistics_dict['samples'][name] = sample_output
+    # parse each sample separately to compute sample specific statistics,
+    # samples are independent and processed in parallel. Samples with the
+    # largest spectral files are started first, such that these do not end
+    # up as the last running tasks.
+    def mzml_size(name: str) -> int:
+        mzml_path = file_loc_dict[name]["mzml"]
+        return 0 if mzml_path is None else mzml_path.stat().st_size
+    
+    sample_order = sorted(file_loc_dict.keys(), key=mzml_size, reverse=True)
+    sample_data = [file_loc_dict[name] for name in sample_order]
+    sample_func = partial(process_sample_data, options=options)
+    if processes == 1:
+        sample_outputs = dict(zip(sample_order,
+                                  map(sample_func, sample_order, sample_data)))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            sample_outputs = dict(zip(sample_order,
+                                      executor.map(sample_func,
+                                                   sample_order,
+                                                   sample_data,
+                                                   chunksize=1)))
+    
+    # store samples in order of the file location dict
+    for name in file_loc_dict.keys():
+        statistics_dict['samples'][name] = sample_outputs[name]
     
     
     db_search_norm_ms2_mean, db_search_norm_ms2_std, db_search_norm_x_vals = score_rank_dist_norm(
@@ -516,21 +360,235 @@ def build_spectral_reference_data(
         normalize_ms2=True,
         ref_dict=statistics_dict
     )
+    # all identification data has been processed, release converted objects
+    convert_ident_obj.cache_clear()
     
     statistics_dict['global']['db search confidence dist norm ms2'] = {
-        'mean': db_search_norm_ms2_mean.tolist(),
-        'std': db_search_norm_ms2_std.tolist(),
-        'x vals': db_search_norm_x_vals.tolist()
+        'mean': db_search_norm_ms2_mean,
+        'std': db_search_norm_ms2_std,
+        'x vals': db_search_norm_x_vals
     }
     statistics_dict['global']['de novo confidence dist norm ms2'] = {
-        'mean': de_novo_norm_ms2_mean.tolist(),
-        'std': de_novo_norm_ms2_std.tolist(),
-        'x vals': de_novo_norm_x_vals.tolist()
+        'mean': de_novo_norm_ms2_mean,
+        'std': de_novo_norm_ms2_std,
+        'x vals': de_novo_norm_x_vals
     }
     
     return statistics_dict
     
 
+def process_sample_data(name: str,
+                        data: Dict[str, Any],
+                        options: RefBuilderOptions) -> Dict[str, Any]:
+    """Compute the reference statistics of a single sample from its spectral,
+    db search and de novo files. Samples are processed independently from each
+    other, which allows processing them in separate processes.
+
+    Args:
+        name (str): Sample name, the source file name of the sample data.
+        data (Dict[str, Any]): File locations (raw data, spectral data,
+            db search and de novo) and parsed identification data of the
+            sample.
+        options (RefBuilderOptions): Reference dataset builder options.
+
+    Returns:
+        Dict[str, Any]: Sample statistics, formatted as a sample entry of the
+            reference dataset.
+    """
+    # initialize empty sample field from the sample template
+    sample_output = copy.deepcopy(sample_output_template)
+    # Open psm and de novo datasets, if they exist
+    db_search = load_sample_ident_data(name,
+                                       data,
+                                       "db search",
+                                       options.db_search_format)
+    if db_search is None:
+        db_search_data = None
+    else:
+        # if file contains data from other source files, omit them
+        if len(db_search.source_files) > 1:
+            db_search = db_search.filter_spectral_name(name)
+        db_search_data = db_search.data
+        
+    de_novo = load_sample_ident_data(name,
+                                     data,
+                                     "de novo",
+                                     options.de_novo_format)
+    if de_novo is None:
+        de_novo_data = None
+    else:
+        if len(de_novo.source_files) > 1:
+            de_novo = de_novo.filter_spectral_name(name)
+        de_novo_data = de_novo.data
+    
+    # wrangle datasets
+    # fetch data from db search
+    if db_search_data is not None:
+        sample_output['mean pept len'] = db_search_data['Sequence'].str.len().mean()
+        sample_output['mean mass'] = db_search_data['Mass'].mean()
+        sample_output['db search matches'] = db_search_data.shape[0]
+        db_search_thres_counts, db_search_thres_names = count_threshold_values(
+            db_search_data,
+            "Confidence",
+            options.db_search_thresholds
+        )
+        sample_output['db search confidence dist'] = {
+            'thresholds': db_search_thres_names,
+            'counts': db_search_thres_counts
+        }
+
+        # add miscleavage distribution to sample
+        miscleave_groups, miscleave_counts = calculate_miscleavages(db_search_data)
+        sample_output['miscleave dist'] = {
+            'miscleavage': miscleave_groups,
+            'counts': list(miscleave_counts)
+        }
+
+    # fetch data from de novo
+    if de_novo_data is not None:
+        sample_output['de novo mean pept len'] = de_novo_data['Sequence']\
+            .str.len()\
+            .mean()
+        sample_output['de novo mean mass'] = de_novo_data['Mass'].mean()
+        sample_output['de novo matches'] = de_novo_data.shape[0]
+        de_novo_thres_counts, de_novo_thres_names = count_threshold_values(
+            de_novo_data,
+            "Confidence",
+            options.de_novo_thresholds)
+        sample_output['de novo confidence dist'] = {'thresholds': de_novo_thres_names,
+                                     'counts': de_novo_thres_counts}
+    
+    # fetch de novo only, which requires both de novo and db search
+    if de_novo is not None and db_search is not None:
+        de_novo_only = de_novo.filter_de_novo_only(db_search)
+        de_novo_only_counts, de_novo_only_names = count_threshold_values(
+            de_novo_only.data,
+            "Confidence",
+            options.de_novo_thresholds
+            )
+        sample_output['de novo only confidence dist'] = {
+            'thresholds': de_novo_only_names,
+            'counts': de_novo_only_counts
+        }
+    
+
+    # fetch spectral information from mzml file
+    spectral = data["mzml"]
+    # fetch spectral data from mzxml file
+    if spectral is not None:
+        mzml_fields = ['scan number', 'MS level',
+                       'peaks count', 'retention time', 'total ion current', 
+                       'precursor charge', 'precursor intensity', 
+                       'ion injection time', 'precursor scan number']
+        
+        print(spectral)
+        
+        # catch errors of unreadable or malformed files only, such that
+        # interrupts and memory errors still abort the build
+        try:
+            with open(spectral, 'rb') as mzml_file:
+                mzml_df, mzml_metadata = mzml_to_df(mzml_file,
+                                                    fields=mzml_fields)
+        except (OSError, ET.ParseError, ValueError, KeyError, IndexError,
+                AttributeError, TypeError) as err:
+            print(f"failed to read mzml file: {err}")
+            mzml_df = None
+            
+        if mzml_df is not None and mzml_df.shape[0] > 0: 
+            sample_output['timestamp'] = mzml_metadata['timestamp']
+            # make complete dataframe numeric, mzml fields are parsed into
+            # numeric values already, only columns that consist solely of
+            # missing values (object dtype) remain to be converted
+            object_cols = mzml_df.select_dtypes(include=object).columns
+            if len(object_cols) > 0:
+                mzml_df = mzml_df.astype(dict.fromkeys(object_cols, float))
+            
+            # obtain statistics from mzxml file, ms level subsets are selected
+            # by boolean masks on the column arrays that are used
+            ms_levels = mzml_df['MS level'].to_numpy()
+            ms2_mask = ms_levels == 2
+            ms1_mask = ms_levels == 1
+            sample_output['ms2 count'] = int(ms2_mask.sum())
+            sample_output['ms1 count'] = int(ms1_mask.sum())
+            
+            sample_output['total rt'] = mzml_df.at[mzml_df.index[-1],
+                                                   'retention time']
+            
+            
+            # compute ms2 intensities at median and top percentiles
+            tic = mzml_df['total ion current'].to_numpy()
+            ms2_int_vals, ms2_int_names = array_to_percentiles(tic[ms2_mask],
+                                                               options.intensity_percentiles)
+            ms1_int_vals, ms1_int_names = array_to_percentiles(tic[ms1_mask],
+                                                               options.intensity_percentiles)
+            sample_output['ms2 intensity'] = {'percentiles': ms2_int_names,
+                                              'values': ms2_int_vals}
+            sample_output['ms1 intensity'] = {'percentiles': ms1_int_names,
+                                              'values': ms1_int_vals}
+
+            # compute transmission losses, only if ms2 spectra present
+            if sample_output['ms2 count'] == 0:
+                sample_output['transmission loss'] = {
+                    'percentiles': ms2_int_names,
+                    'values': [np.nan, np.nan, np.nan]}
+                sample_output['transmission loss ion injection time scaled'] = {
+                    'percentiles': ms2_int_names,
+                    'values': [np.nan, np.nan, np.nan]}
+            else:
+                # fetch precursor ion injection time, only the columns needed
+                # for matching precursor scans are selected
+                prec_inj_time = fetch_precursor_ion_injection_time(
+                    mzml_df.loc[ms2_mask, ['precursor scan number']],
+                    mzml_df.loc[ms1_mask, ['scan number', 'ion injection time']]
+                )
+                prec_int = mzml_df['precursor intensity'].to_numpy()[ms2_mask]
+                ms2_tic = tic[ms2_mask]
+                ms2_inj_time = mzml_df['ion injection time'].to_numpy()[ms2_mask]
+
+                # compute transmission losses (ion injection time scaled and unscaled)
+                trm_loss_ion_inj = transmission_loss(prec_int,
+                                                     ms2_tic,
+                                                     prec_inj_time.to_numpy(),
+                                                     ms2_inj_time)
+                trm_loss = transmission_loss(prec_int, ms2_tic)
+
+                # compute percentiles for both
+                trm_loss_ion_inj_vals, trm_loss_ion_inj_names = array_to_percentiles(
+                    trm_loss_ion_inj,
+                    options.transmission_loss_percentiles,
+                    True)
+                trm_loss_vals, trm_loss_names = array_to_percentiles(
+                    trm_loss,
+                    options.transmission_loss_percentiles,
+                    True)
+                
+                # store both in output dataset
+                sample_output['transmission loss'] = {
+                    'percentiles': trm_loss_names,
+                    'values': trm_loss_vals}
+                sample_output['transmission loss ion injection time scaled'] = {
+                    'percentiles': trm_loss_ion_inj_names,
+                    'values': trm_loss_ion_inj_vals}
+        
+            # count occurrences of each charge, charges are small positive
+            # integers, so they can be counted by index in a single pass
+            charge_arr = mzml_df['precursor charge'].to_numpy()[ms2_mask]
+            is_charged = ~np.isnan(charge_arr)
+            charge_counts = np.bincount(charge_arr[is_charged].astype(np.int64))
+            charges = np.flatnonzero(charge_counts)
+            # format charge names in the dtype of the source column
+            charge_names = charges.astype(charge_arr.dtype).astype(str).tolist()
+            counts = charge_counts[charges].tolist()
+            # spectra without charge are grouped in a separate category
+            if not is_charged.all():
+                charge_names.append(str(np.nan))
+                counts.append(int((~is_charged).sum()))
+            sample_output['charge dist'] = {'charge': charge_names,
+                                            'counts': counts}
+
+    return sample_output
+
+
 def write_reference_file(ref_dict: Dict[str, Dict[str, Any]],
                           filename: str, write_loc: Path):
     """Write spectral reference dataset to json file.
@@ -541,12 +599,10 @@ def write_reference_file(ref_dict: Dict[str, Dict[str, Any]],
         write_loc (Path): Location in filesystem to store json.
     """
     def unexp_val_manager(val):
-        if isinstance(val, (int, np.integer)):
-            return int(val)
-        if isinstance(val, float) and val != val:
-            return None
-        print(val, type(val))
-        raise TypeError
+        # numpy scalars and arrays are converted to their python equivalents
+        if isinstance(val, (np.generic, np.ndarray)):
+            return val.tolist()
+        raise TypeError(f"Object of type {type(val).__name__} is not JSON serializable")
     
     data_str = json.dumps(ref_dict,
                           default=unexp_val_manager)
@@ -566,7 +622,8 @@ def build_ref_data(
     intensity_percentiles: List[int | float] = [50, 90, 99],
     transmission_loss_percentiles: List[int | float] = [50, 90, 99],
     db_search_file_pattern: str | None = None,
-    de_novo_file_pattern: str | None = None
+    de_novo_file_pattern: str | None = None,
+    processes: int | None = None
     ) -> None:
     """Build experimental reference statistics dataset from collection of
     raw files, spectral files and metaproteomics data output files. By supplying
@@ -614,6 +671,9 @@ def build_ref_data(
             if filenames were changed, invalidating the default file match pattern,
             or for using formats that do not have a unique default pattern. 
             Defaults to None.
+        processes (int | None, optional): Number of worker processes used to
+            process samples in parallel. If None, the number of CPUs is used.
+            Defaults to None.
     """
     
     # set defaults for file pattern to search through
@@ -637,9 +697,12 @@ def build_ref_data(
     print("parse root directory for data files...")
     file_loc_dict = fetch_file_locations(ref_options)
     
-    mzml_count = len([x["mzml"] for x in file_loc_dict.values() if x["mzml"] is not None])
-    db_search_count = len([x["db search"] for x in file_loc_dict.values() if x["db search"] is not None])
-    de_novo_count = len([x["de novo"] for x in file_loc_dict.values() if x["de novo"] is not None])
+    # count found files of each type in a single pass
+    mzml_count, db_search_count, de_novo_count = 0, 0, 0
+    for sample_files in file_loc_dict.values():
+        mzml_count += sample_files["mzml"] is not None
+        db_search_count += sample_files["db search"] is not None
+        de_novo_count += sample_files["de novo"] is not None
 
     print(f"found {len(file_loc_dict.keys())} experiments:")
     print(f"{mzml_count} mzML files")
@@ -648,7 +711,9 @@ def build_ref_data(
     
 
     print("Build reference dataset...")
-    ref_data_dict = build_spectral_reference_data(file_loc_dict, ref_options)
+    ref_data_dict = build_spectral_reference_data(file_loc_dict,
+                                                  ref_options,
+                                                  processes)
     print("write reference dataset to json...")
     write_reference_file(ref_data_dict, file_name, output_loc)
     
\ No newline at end of file
@@ -1,66 +1,198 @@
 from __future__ import annotations
 
-from typing import List, Dict, Literal, overload
+import os
+from functools import lru_cache
+from typing import Iterator, Iterable, List, Dict, Tuple, Any, Literal, overload
 from pathlib import Path
 import pandas as pd
 
-from scipy.interpolate import CubicSpline
-# from metapepview.backend.utils.numpy_utils import CubicSpline
 
-from metapepview.backend.spectral_ref_builder.definitions import RefBuilderOptions
+from metapepview.backend.spectral_ref_builder.definitions import RefBuilderOptions, source_file_fields
 from metapepview.backend.type_operations import * # load_metapep_db_search, load_metapep_de_novo, db_search_importers, de_novo_importers
 from metapepview.backend.utils import *
 
 
-def ident_file_source(ident_file: Path,
-                      filetype: str,
-                      options: RefBuilderOptions) -> Sequence[str]:
+def iterate_directory_files(root_dir: str | Path) -> Iterator[os.DirEntry]:
+    """Recursively iterate over all files in a directory tree in a single pass.
+    Files of a directory are yielded before descending into its subdirectories,
+    matching the traversal order of Path.rglob. Symbolic links to directories
+    are not followed.
+
+    Args:
+        root_dir (str | Path): Root directory to iterate over.
+
+    Yields:
+        os.DirEntry: Directory entry of each file in the directory tree.
+    """
+    sub_dirs = []
+    with os.scandir(root_dir) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                sub_dirs.append(entry.path)
+            else:
+                yield entry
+    
+    for sub_dir in sub_dirs:
+        yield from iterate_directory_files(sub_dir)
+
+
+def read_ident_file(ident_file: Path,
+                    filetype: str,
+                    options: RefBuilderOptions) -> DbSearchMethods | DeNovoMethods:
+    """Read db search or de novo identification file into its format specific
+    class object. The object is stored during file collection, such that the
+    file only has to be parsed once.
+
+    Args:
+        ident_file (Path): Location of identification file.
+        filetype (str): Type of identification file, 'db search' or 'de novo'.
+        options (RefBuilderOptions): Reference dataset builder options.
+
+    Raises:
+        ValueError: Invalid filetype supplied.
+
+    Returns:
+        DbSearchMethods | DeNovoMethods: Identification data object.
+    """
     if filetype == "db search":
-        source = db_search_importers[options.db_search_format]\
-            .read_file(ident_file)\
-            .get_source_files()
+        return db_search_importers[options.db_search_format].read_file(ident_file)
     elif filetype == "de novo":
-        source = de_novo_importers[options.de_novo_format]\
-            .read_file(ident_file)\
-            .get_source_files()
+        return de_novo_importers[options.de_novo_format].read_file(ident_file)
     else:
         raise ValueError("Invlid filetype supplied")
-    return source
+
+
+@overload
+def load_sample_ident_data(name: str,
+                           data: Dict[str, Any],
+                           file_type: Literal['db search'],
+                           file_format: DbSearchSource) -> MetaPepDbSearch | None:
+    ...
+
+@overload
+def load_sample_ident_data(name: str,
+                           data: Dict[str, Any],
+                           file_type: Literal['de novo'],
+                           file_format: DeNovoSource) -> MetaPepDeNovo | None:
+    ...
+
+def load_sample_ident_data(name: str,
+                           data: Dict[str, Any],
+                           file_type: Literal['db search', 'de novo'],
+                           file_format: DbSearchSource | DeNovoSource
+                           ) -> MetaPepDbSearch | MetaPepDeNovo | None:
+    """Load identification data of a sample into MetaPep format. If the
+    identification file was already parsed during file collection, the stored
+    object is converted, otherwise the file is read from its location.
+
+    Args:
+        name (str): Sample name.
+        data (Dict[str, Any]): File locations and parsed identification objects
+            of the sample.
+        file_type (Literal['db search', 'de novo']): File type to extract.
+            Either db search or de novo data.
+        file_format (DbSearchSource | DeNovoSource): Format of db search or 
+            de novo data.
+
+    Returns:
+        MetaPepDbSearch | MetaPepDeNovo | None: Identification data of sample,
+            None if no identification file present for sample.
+    """
+    ident_obj = data.get(f"{file_type} obj")
+    if ident_obj is not None:
+        return convert_ident_obj(ident_obj, file_type)
+
+    df_path = data[file_type]
+    if df_path is None:
+        return None
+    if file_type == 'db search':
+        return load_metapep_db_search(df_path, name, file_format) #type:ignore
+    return load_metapep_de_novo(df_path, name, file_format) #type:ignore
     
 
-def add_to_source_dict(output_dict: Dict[str, Dict[str, Path | None]],
+@lru_cache(maxsize=64)
+def convert_ident_obj(ident_obj: DbSearchMethods | DeNovoMethods,
+                      file_type: Literal['db search', 'de novo']
+                      ) -> MetaPepDbSearch | MetaPepDeNovo:
+    """Convert parsed identification object into MetaPep format. Conversions
+    are cached per object, such that a file shared by multiple samples, or
+    processed in multiple steps, is only converted once. Sample specific data
+    is selected afterwards by filtering on source file.
+
+    Note:
+        The cache keeps converted objects in memory, clear it with
+        `convert_ident_obj.cache_clear()` once the dataset is built.
+
+    Args:
+        ident_obj (DbSearchMethods | DeNovoMethods): Identification data object.
+        file_type (Literal['db search', 'de novo']): File type of the object.
+
+    Returns:
+        MetaPepDbSearch | MetaPepDeNovo: Identification data in MetaPep format.
+    """
+    if file_type == 'db search':
+        return ident_obj.to_metapep_db_search()
+    return ident_obj.to_metapep_de_novo()
+
+
+def add_to_source_dict(output_dict: Dict[str, Dict[str, Any]],
                        sources: Sequence[str],
                        file: Path, 
-                       filetype: str) -> Dict[str, Dict[str, Path | None]]:
+                       filetype: str,
+                       file_obj: Any | None = None) -> Dict[str, Dict[str, Any]]:
     """Add data file location information to source files that correspond to 
     the data files. For example, a db search output file with three source files
     in the dataset will be added to each of the three source files in the output
     dictionary.
 
     Args:
-        output_dict (Dict[str, Dict[str, Path  |  None]]): Source file to data 
+        output_dict (Dict[str, Dict[str, Any]]): Source file to data 
             files mapping dictionary.
         sources (Sequence[str]): Source file keys to update with new file data.
         file (Path): Path to file to update source file keys with.
         filetype (str): Type of file data to add into the mapping dictionary.
+        file_obj (Any | None, optional): Parsed data of the file, stored under
+            the '<filetype> obj' key. Defaults to None.
 
     Returns:
-        Dict[str, Dict[str, Path | None]]: Updated source file to data files
+        Dict[str, Dict[str, Any]]: Updated source file to data files
             mapping dictionary.
     """
-    for source_name in sources:
-        # locate raw file in dictionary
-        raw_path = output_dict.get(source_name, None)
-
-        if raw_path is None:
-            output_dict[source_name] = {"raw": None,
-                                        "db search": None,
-                                        "de novo": None,
-                                        "mzxml": None,
-                                        "mzml": None}
-        
-        # add db search to output data
-        output_dict[source_name][filetype] = file
+    return add_many_to_source_dict(output_dict,
+                                   [(sources, file, file_obj)],
+                                   filetype)
+
+
+def add_many_to_source_dict(
+    output_dict: Dict[str, Dict[str, Any]],
+    entries: Iterable[Tuple[Sequence[str], Path, Any | None]],
+    filetype: str) -> Dict[str, Dict[str, Any]]:
+    """Add location information of a batch of data files of the same type to
+    the source files that correspond to them. See `add_to_source_dict`.
+
+    Args:
+        output_dict (Dict[str, Dict[str, Any]]): Source file to data 
+            files mapping dictionary.
+        entries (Iterable[Tuple[Sequence[str], Path, Any | None]]): Source
+            file keys, file path and parsed file data (or None) of each file.
+        filetype (str): Type of file data to add into the mapping dictionary.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Updated source file to data files
+            mapping dictionary.
+    """
+    obj_key = f"{filetype} obj"
+    for sources, file, file_obj in entries:
+        for source_name in sources:
+            # add empty entry if source file not yet present in dictionary
+            source_entry = output_dict.get(source_name)
+            if source_entry is None:
+                source_entry = output_dict[source_name] = dict.fromkeys(source_file_fields)
+            
+            # add file to output data
+            source_entry[filetype] = file
+            if file_obj is not None:
+                source_entry[obj_key] = file_obj
         
     return output_dict
 
@@ -102,53 +234,81 @@ def count_threshold_values(
     if len(threshold_set) == 0:
         return ([], [])
     
-    # initialize output array
-    counts_set = []
-    count_names_set = []
-    
     # sort given list of threshold values ascending
     threshold_set = sorted(threshold_set)
     
-    # first, compute count below all threshold values, if not cumulative
-    if cumulative is not True:
-        counts_set.append((df[column_name] < threshold_set[0]).sum())
-        count_names_set.append(f"<{threshold_set[0]}")
+    # sort column values once (missing values omitted), the counts of all
+    # threshold groups then follow from their positions in the sorted array
+    values = df[column_name].to_numpy(dtype=float)
+    values = np.sort(values[~np.isnan(values)])
+    below_count = np.searchsorted(values, threshold_set, side='left')
+    below_equal_count = np.searchsorted(values, threshold_set, side='right')
+    above_count = values.shape[0] - below_equal_count
     
-    # loop through threshold set to compute counts
-    for i, val in enumerate(threshold_set):
-        if cumulative is True or i == len(threshold_set) - 1:
-            counts_set.append((df[column_name] > val).sum())
-            count_names_set.append(f">{val}")
-        else:
-            counts_set.append(((df[column_name] > val) & 
-                               (df[column_name] < threshold_set[i+1])).sum())
-            count_names_set.append(f"{val} < x < {threshold_set[i+1]}")
+    if cumulative is True:
+        counts = above_count
+        count_names_set = [f">{val}" for val in threshold_set]
+    else:
+        # count below all threshold values, between consecutive threshold
+        # values and above the highest threshold value
+        between_count = np.maximum(below_count[1:] - below_equal_count[:-1], 0)
+        counts = np.concatenate((below_count[:1], between_count, above_count[-1:]))
+        count_names_set = [f"<{threshold_set[0]}"] + \
+            [f"{val} < x < {threshold_set[i+1]}"
+             for i, val in enumerate(threshold_set[:-1])] + \
+            [f">{threshold_set[-1]}"]
     
     # divide counts by division factor if value given
     if div_factor is not None:
-        counts_set = (np.array(counts_set) / div_factor).tolist()
+        counts = counts.astype(np.float64)
+        counts /= div_factor
+    counts_set = counts.tolist()
     
     return (counts_set, count_names_set)
 
 
+def sample_score_column(ident_data: MetaPepDbSearch | MetaPepDeNovo,
+                        name: str,
+                        score_col: str) -> pd.DataFrame:
+    """Project identification data onto the confidence column of a single
+    sample. If the data contains multiple source files, only rows of the
+    sample are kept. Other columns are not copied.
+
+    Args:
+        ident_data (MetaPepDbSearch | MetaPepDeNovo): Identification data.
+        name (str): Sample name, matched to the source file column.
+        score_col (str): Name of confidence column.
+
+    Returns:
+        pd.DataFrame: Dataframe with only the confidence column of the sample.
+    """
+    data = ident_data.data
+    if len(ident_data.source_files) > 1:
+        return data.loc[data['Source File'] == name, [score_col]]
+    return data[[score_col]]
+
+
 @overload
-def score_rank_dist(data_dict: Dict[str, Dict[str, Path | None]],
+def score_rank_dist(data_dict: Dict[str, Dict[str, Any]],
                     file_type: Literal['db search'],
                     file_format: DbSearchSource,
-                    score_col: str) -> Tuple[np.ndarray, np.ndarray]:
+                    score_col: str,
+                    compute_std: bool = True) -> Tuple[np.ndarray, np.ndarray | None]:
     ...
 
 @overload
-def score_rank_dist(data_dict: Dict[str, Dict[str, Path | None]],
+def score_rank_dist(data_dict: Dict[str, Dict[str, Any]],
                     file_type: Literal['de novo'],
                     file_format: DeNovoSource,
-                    score_col: str) -> Tuple[np.ndarray, np.ndarray]:
+                    score_col: str,
+                    compute_std: bool = True) -> Tuple[np.ndarray, np.ndarray | None]:
     ...
 
-def score_rank_dist(data_dict: Dict[str, Dict[str, Path | None]],
+def score_rank_dist(data_dict: Dict[str, Dict[str, Any]],
                     file_type: Literal['db search', 'de novo'],
                     file_format: DbSearchSource | DeNovoSource,
-                    score_col: str) -> Tuple[np.ndarray, np.ndarray]:
+                    score_col: str,
+                    compute_std: bool = True) -> Tuple[np.ndarray, np.ndarray | None]:
     """Construct a distribution of confidence scores from a set of proteomics
     (db search, de novo) experiments by extracting the confidence column,
     sorting them descending and computing mean and standard deviation of the
@@ -156,19 +316,26 @@ def score_rank_dist(data_dict: Dict[str, Dict[str, Path | None]],
     n'th peptide (when sorted descending) across the set of experiments.
 
     Args:
-        data_dict (Dict[str, Dict[str, Path | None]]): Dataset of file locations.
+        data_dict (Dict[str, Dict[str, Any]]): Dataset of file locations.
         file_type (Literal['db search', 'de novo']): File type to extract.
             Either db search or de novo data.
         file_format (DbSearchSource | DeNovoSource): Format of db search or 
             de novo data.
         score_col (str): Name of confidence column.
+        compute_std (bool, optional): Compute the standard deviation of the
+            distribution. If False, None is returned in place of the std values.
+            Defaults to True.
 
     Returns:
-        Tuple[np.ndarray, np.ndarray]: Score confidence distribution data,
+        Tuple[np.ndarray, np.ndarray | None]: Score confidence distribution data,
             {mean values, std values}.
     """
-    rank_mat = []
-    max_len = 0
+    # accumulate sums and squared sums of scores per rank, such that mean and
+    # std are obtained without storing the scores of all experiments. Ranks
+    # beyond the number of matches of an experiment count as 0.
+    score_sum = np.zeros(0)
+    score_sq_sum = np.zeros(0)
+    sample_count = 0
 
     for name, data in data_dict.items():
         df_path = data[file_type]
@@ -176,38 +343,44 @@ def score_rank_dist(data_dict: Dict[str, Dict[str, Path | None]],
             continue
         
         # extract confidence column from data
-        if file_type == 'db search':
-            df = load_metapep_db_search(df_path, name, file_format) #type:ignore
-        elif file_type == 'de novo':
-            df = load_metapep_de_novo(df_path, name, file_format) #type:ignore
+        df = load_sample_ident_data(name, data, file_type, file_format) #type:ignore
         
-        # if file contains data from other source files, omit them
-        if len(df.source_files) > 1:
-            df = df.filter_spectral_name(name)
+        # only the confidence column of the sample is needed
+        score_df = sample_score_column(df, name, score_col)
         
-        score_rank = fetch_sort_column(df.data, score_col)
-        rank_mat.append(score_rank.values.tolist())
-        max_len = max(max_len, score_rank.shape[0])
+        score_rank = fetch_sort_column(score_df, score_col).to_numpy(dtype=float)
+        rank_len = score_rank.shape[0]
+        if rank_len > score_sum.shape[0]:
+            extend_len = rank_len - score_sum.shape[0]
+            score_sum = np.pad(score_sum, (0, extend_len))
+            if compute_std is True:
+                score_sq_sum = np.pad(score_sq_sum, (0, extend_len))
+        score_sum[:rank_len] += score_rank
+        if compute_std is True:
+            score_sq_sum[:rank_len] += score_rank * score_rank
+        sample_count += 1
 
     # compute error bars
-    if len(rank_mat) > 0:
-        rank_mat = np.array([x + (max_len - len(x))*[0] for x in rank_mat])
-        mean_array = rank_mat.mean(axis=0)
-        std_array = rank_mat.std(axis=0)
+    if sample_count > 0:
+        mean_array = score_sum / sample_count
+        std_array = np.sqrt(np.maximum(score_sq_sum / sample_count - mean_array * mean_array,
+                                       0.0)) if compute_std is True else None
     else:
-        mean_array, std_array = np.array([]), np.array([])
+        mean_array = np.array([])
+        std_array = np.array([]) if compute_std is True else None
     
     return (mean_array, std_array)
 
 
-def score_rank_dist_norm(data_dict: Dict[str, Dict[str, Path | None]],
+def score_rank_dist_norm(data_dict: Dict[str, Dict[str, Any]],
                          file_type: Literal['db search', 'de novo'],
                          file_format: DbSearchSource | DeNovoSource,
                          score_col: str,
                          npoints: int = 1000,
                          normalize_ms2: bool = False,
                          ref_dict: dict | None = None,
-                         fillna: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+                         fillna: bool = False,
+                         compute_std: bool = True) -> Tuple[np.ndarray, np.ndarray | None, np.ndarray]:
     """Construct a normalized distribution of confidence scores from a set of
     proteomics (db search, de novo) experiments by extracting the confidence
     column, sorting them descending and computing mean and standard deviation of
@@ -218,7 +391,7 @@ def score_rank_dist_norm(data_dict: Dict[str, Dict[str, Path | None]],
     equal or higher confidence.
 
     Args:
-        data_dict (Dict[str, Dict[str, Path | None]]): Dataset of file locations.
+        data_dict (Dict[str, Dict[str, Any]]): Dataset of file locations.
         file_type (Literal['db search', 'de novo']): File type to extract.
             Either db search or de novo data.
         file_format (DbSearchSource | DeNovoSource): Format of db search or 
@@ -234,6 +407,9 @@ def score_rank_dist_norm(data_dict: Dict[str, Dict[str, Path | None]],
         fillna (bool, optional): If True, the fraction of scans/matches below
             the threshold is filled with nan values, else it is filled with
             0's. Defaults to False.
+        compute_std (bool, optional): Compute the standard deviation of the
+            distribution. If False, None is returned in place of the std values.
+            Defaults to True.
             
     Note:
         Not an exact method, it samples n evenly spaced points from
@@ -244,8 +420,8 @@ def score_rank_dist_norm(data_dict: Dict[str, Dict[str, Path | None]],
         ValueError: No reference dict provided while normalized by total MS2 scans.
 
     Returns:
-        Tuple[np.ndarray, np.ndarray, np.ndarray]: Score confidence distribution
-            data, {mean values, std values, x values}.
+        Tuple[np.ndarray, np.ndarray | None, np.ndarray]: Score confidence
+            distribution data, {mean values, std values, x values}.
     """
     
     
@@ -254,7 +430,16 @@ def score_rank_dist_norm(data_dict: Dict[str, Dict[str, Path | None]],
     # Note: Suboptimal method, it samples n evenly spaced points from
     # the peptide match datasets. Ideally, a non-linear curve fit function
     # is performed.
-    rank_mat = []
+    # scores are written directly into rows of a preallocated matrix. Without
+    # ms2 normalization, all distributions have npoints values, otherwise the
+    # matrix is widened when an experiment exceeds the current width. Cells
+    # without scores keep the fill value (0 or nan). Scores are stored in
+    # single precision to halve the matrix size.
+    fill_value = 0.0 if fillna is True else np.nan
+    n_exp = sum(1 for data in data_dict.values() if data[file_type] is not None)
+    init_len = npoints if normalize_ms2 is False else 0
+    rank_mat = np.full((n_exp, init_len), fill_value, dtype=np.float32)
+    n_rows = 0
     max_len = 0
     max_x_axis = []
 
@@ -264,18 +449,14 @@ def score_rank_dist_norm(data_dict: Dict[str, Dict[str, Path | None]],
             continue
         
         # extract confidence column from data
-        if file_type == 'db search':
-            df = load_metapep_db_search(df_path, name, file_format) #type:ignore
-        elif file_type == 'de novo':
-            df = load_metapep_de_novo(df_path, name, file_format) #type:ignore
+        df = load_sample_ident_data(name, data, file_type, file_format) #type:ignore
         
-        # if file contains data from other source files, omit them
-        if len(df.source_files) > 1:
-            df = df.filter_spectral_name(name)
+        # only the confidence column of the sample is needed
+        score_df = sample_score_column(df, name, score_col)
         
         # either normalize by total matches, or by ms2 count
         if normalize_ms2 is False:
-            score_vals, x_axis = pept_match_dist_normalize(df.data,
+            score_vals, x_axis = pept_match_dist_normalize(score_df,
                                                            score_col,
                                                            npoints,
                                                            None)
@@ -285,7 +466,7 @@ def score_rank_dist_norm(data_dict: Dict[str, Dict[str, Path | None]],
             total_scans = ref_dict["samples"][name]["ms2 count"]
             if total_scans != total_scans or total_scans is None:
                 continue 
-            score_vals, x_axis = pept_match_dist_normalize(df.data,
+            score_vals, x_axis = pept_match_dist_normalize(score_df,
                                                            score_col,
                                                            npoints,
                                                            total_scans)
@@ -295,21 +476,26 @@ def score_rank_dist_norm(data_dict: Dict[str, Dict[str, Path | None]],
         else:
             raise ValueError("Need reference dict to normalize ms2.")
             
-        rank_mat.append(score_vals.tolist())
-
-    # add nan or 0's to smaller lists to equate matrix dimensions
-    if fillna is True:
-        rank_mat = np.array([x + (max_len - len(x))*[0.0] for x in rank_mat])
-    else:
-        rank_mat = np.array([x + (max_len - len(x))*[np.nan] for x in rank_mat])
+        score_len = score_vals.shape[0]
+        if score_len > rank_mat.shape[1]:
+            rank_mat = np.pad(rank_mat,
+                              ((0, 0), (0, score_len - rank_mat.shape[1])),
+                              constant_values=fill_value)
+        rank_mat[n_rows, :score_len] = score_vals
+        n_rows += 1
+
+    # drop rows of experiments skipped due to missing ms2 counts
+    rank_mat = rank_mat[:n_rows]
         
-    rank_mat = np.array(rank_mat)
-    # compute mean and error bars
+    # compute mean and error bars, the mean is reused for the std computation
     if rank_mat.shape[0] > 0:
-        mean_array = np.nanmean(rank_mat, axis=0)
-        std_array = np.nanstd(rank_mat, axis=0)
+        mean_array = np.nanmean(rank_mat, axis=0, dtype=np.float64, keepdims=True)
+        std_array = np.nanstd(rank_mat, axis=0, dtype=np.float64, mean=mean_array) \
+            if compute_std is True else None
+        mean_array = mean_array[0]
     else:
-        mean_array, std_array = np.array([]), np.array([])
+        mean_array = np.array([])
+        std_array = np.array([]) if compute_std is True else None
     
     return (mean_array, std_array, np.array(max_x_axis))
 
@@ -359,12 +545,12 @@ def pept_match_dist_normalize(df: pd.DataFrame,
     Returns:
         Tuple[np.ndarray, np.ndarray]: Confidence scores, x-axis range array
     """
-    score_rank = fetch_sort_column(df, score_col)
-    yvals = score_rank.values
-    xvals = score_rank.index.to_numpy()
+    # sorted column has a reset index, the rank positions are a plain range
+    yvals = fetch_sort_column(df, score_col).to_numpy(dtype=float)
+    total_matches = yvals.shape[0]
+    xvals = np.arange(total_matches)
     
     # sample n samples evenly spaced over the complete dataset
-    total_matches = score_rank.shape[0]
     
     # normalization range over all MS2 scans, points outside match range are zeros
     if total_scans is not None:
@@ -372,14 +558,14 @@ def pept_match_dist_normalize(df: pd.DataFrame,
         match_scan_ratio = total_matches / total_scans
         norm_xvals = xvals / total_scans
         
-        spline_model = CubicSpline(norm_xvals, yvals)
-        
         # define consistent spacing based on original defined npoints
         spacing = 1 / npoints
         # normalization towards MS2 does not cap at 100%. To compute mean + std,
         # rank steps are kept equal, but samples above 100 get more datapoints
-        sample_x = np.arange(0, match_scan_ratio, spacing)
-        sample_y = spline_model(sample_x)
+        sample_count = int(np.ceil(match_scan_ratio * npoints))
+        sample_x = np.linspace(0.0, sample_count * spacing, sample_count,
+                               endpoint=False)
+        sample_y = np.interp(sample_x, norm_xvals, yvals)
 
         return (sample_y, sample_x * 100) # convert x to %
 
@@ -387,49 +573,62 @@ def pept_match_dist_normalize(df: pd.DataFrame,
         # rescale x axis by dividing by total matches
         norm_xvals = xvals / (total_matches - 1)
         
-        spline_model = CubicSpline(norm_xvals, yvals)
-        
         # define consistent spacing based on original defined npoints
         spacing = 1 / npoints
-        sample_x = np.arange(0, 1, spacing)
-        sample_y = spline_model(sample_x)
+        sample_x = np.linspace(0.0, 1.0, npoints, endpoint=False)
+        sample_y = np.interp(sample_x, norm_xvals, yvals)
         
         return (sample_y, sample_x * 100) # convert x to %
 
 
-def transmission_loss(prec_int_array: pd.Series,
-                      ms2_tic_array: pd.Series,
-                      prec_injection_time_array: pd.Series | None = None,
-                      ms2_injection_time_array: pd.Series | None = None,
-                      invert_comp: bool = False) -> pd.Series:
+def transmission_loss(prec_int_array: pd.Series | np.ndarray,
+                      ms2_tic_array: pd.Series | np.ndarray,
+                      prec_injection_time_array: pd.Series | np.ndarray | None = None,
+                      ms2_injection_time_array: pd.Series | np.ndarray | None = None,
+                      invert_comp: bool = False) -> pd.Series | np.ndarray:
     """Compute transmission loss for selected peptide signals. Transmission loss
     is computed by dividing total ion current of the MS2 scan with the MS2 precursor
     signal. Computation can also be inverted to compute transmission efficiency.
 
     Args:
-        prec_int_array (pd.Series): Series of precursor intensities.
-        ms2_tic_array (pd.Series): Series of corresponding MS2 total signal
-            intensities.
-        prec_injection_time_array (pd.Series | None, optional): Series of
-            injection times for precursor spectra. Defaults to None.
-        ms2_injection_time_array (pd.Series | None, optional): Series of
-            injection times for ms2 spectra. Defaults to None.
+        prec_int_array (pd.Series | np.ndarray): Series of precursor intensities.
+        ms2_tic_array (pd.Series | np.ndarray): Series of corresponding MS2 total
+            signal intensities.
+        prec_injection_time_array (pd.Series | np.ndarray | None, optional):
+            Series of injection times for precursor spectra. Defaults to None.
+        ms2_injection_time_array (pd.Series | np.ndarray | None, optional):
+            Series of injection times for ms2 spectra. Defaults to None.
         invert_comp (bool, optional): Invert division to compute transmission
             efficiency. Defaults to False.
 
+    Note:
+        Input arrays are combined by position. If the precursor intensities
+        are given as series, the output series takes over its index.
+
     Returns:
-        pd.Series: Series of transmission losses.
+        pd.Series | np.ndarray: Series of transmission losses, of the same type
+            as the input arrays.
     """
-    # divide signal intensities by injection times to take into account accumulation time
+    prec_int = np.asarray(prec_int_array, dtype=float)
+    ms2_tic = np.asarray(ms2_tic_array, dtype=float)
+
+    # divide signal intensities by injection times to take into account
+    # accumulation time, both divisions are merged into a single fraction
     if prec_injection_time_array is not None and ms2_injection_time_array is not None:
-        prec_int_array = prec_int_array / prec_injection_time_array
-        ms2_tic_array = ms2_tic_array / ms2_injection_time_array
+        numerator = prec_int * np.asarray(ms2_injection_time_array, dtype=float)
+        denominator = ms2_tic * np.asarray(prec_injection_time_array, dtype=float)
+    else:
+        numerator, denominator = prec_int, ms2_tic
 
     # divide precursor with ms2 signal, or vice versa if invert_comp
-    if invert_comp is False:
-        return prec_int_array / ms2_tic_array
-    else:
-        return ms2_tic_array / prec_int_array
+    if invert_comp is True:
+        numerator, denominator = denominator, numerator
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trm_loss = numerator / denominator
+
+    if isinstance(prec_int_array, pd.Series):
+        return pd.Series(trm_loss, index=prec_int_array.index)
+    return trm_loss
 
 def fetch_precursor_ion_injection_time(ms2_df: pd.DataFrame,
                                        ms1_df: pd.DataFrame) -> pd.Series:
@@ -443,16 +642,17 @@ def fetch_precursor_ion_injection_time(ms2_df: pd.DataFrame,
         ms1_df (pd.DataFrame): Dataframe of MS1 scans.
 
     Returns:
-        pd.Series: Series of precursor injection times based on ms2 df rows.
+        pd.Series: Series of precursor injection times based on ms2 df rows,
+            with the index of the ms2 df.
     """
-    # fetch precursor scan number column as separate df
-    prec_scan_nums = ms2_df[['precursor scan number']]
+    # index ms1 injection times by scan number, scan numbers are unique for
+    # valid data, duplicates (e.g. missing scan numbers) are dropped for lookup
+    ms1_inj_time = ms1_df.set_index('scan number')['ion injection time']
+    ms1_inj_time = ms1_inj_time[~ms1_inj_time.index.duplicated()]
     
-    # merge ms1 data with precursor scan number df and fetch ion injection time
-    prec_inj_time = prec_scan_nums.merge(ms1_df[['scan number', 'ion injection time']],
-                                        left_on='precursor scan number',
-                                        right_on='scan number',
-                                        how='left')['ion injection time']
+    # look up injection time of each precursor scan, missing scans become nan
+    prec_inj_time = ms1_inj_time.reindex(ms2_df['precursor scan number'].to_numpy())
+    prec_inj_time.index = ms2_df.index
     return prec_inj_time
 
 def array_to_percentiles(input_array: np.ndarray,
@@ -472,23 +672,21 @@ def array_to_percentiles(input_array: np.ndarray,
         Tuple[List[float], List[str]]: Tuple with list of percentile values, and 
             percentile names.
     """
-    out_names, out_vals = [], []
-    
+    out_names = []
     for pval in percentiles:
         if pval == 50:
-            name = 'median'
+            out_names.append('median')
         else:
-            name = f'{pval}th'
-        
-        if len(input_array) == 0:
-            scan_int_pt = np.nan
-        elif ignore_nan is True:
-            scan_int_pt = np.nanpercentile(input_array, pval)
-        else:
-            scan_int_pt = np.percentile(input_array, pval)
-
-        out_names.append(name)
-        out_vals.append(scan_int_pt)
+            out_names.append(f'{pval}th')
+    
+    # compute all percentiles in a single call, such that the input array is
+    # partitioned once instead of once for every percentile
+    if len(input_array) == 0:
+        out_vals = [np.nan] * len(percentiles)
+    elif ignore_nan is True:
+        out_vals = np.nanpercentile(input_array, percentiles).tolist()
+    else:
+        out_vals = np.percentile(input_array, percentiles).tolist()
         
     return (out_vals, out_names)
     
@@ -529,23 +727,19 @@ def calculate_miscleavages(db_search: pd.DataFrame) -> Tuple[List[str], List[int
     """
     categories = ["0", "1", "2", "3", ">3"]
 
-    # count all occurences of cleave amino acids not at the end of the sequence
-    # by removing last character. Take into account potential empty strings or
-    # nan values
-    miscleave_series: pd.Series = db_search['Sequence']\
-        .apply(lambda x: x if x != x or x == "" else x[:-1])\
-        .str.count("[KR]")\
-        .value_counts()
-    
-    # convert categories to string
-    miscleave_series.index = [str(x) for x in miscleave_series.index]
-
-    # store all cleavage categories in counts array
-    counts = list()
-    for cat in categories[:-1]:
-        counts.append(miscleave_series.get(cat, 0))
-
-    # final counts are all values outside of defined categories
-    counts.append(miscleave_series.drop(categories[:-1], errors="ignore").sum())
+    # count all occurences of cleave amino acids not at the end of the sequence,
+    # that is, followed by at least one other character. Nan values are not
+    # counted towards any category
+    miscleave_counts = db_search['Sequence']\
+        .str.count("[KR](?=.)")\
+        .dropna()\
+        .to_numpy(dtype=np.int64)
+
+    # bins are indexed by the (numeric) number of miscleavages, the final
+    # category holds all values outside of the defined categories
+    n_cats = len(categories) - 1
+    bins = np.bincount(miscleave_counts, minlength=n_cats + 1)
+    counts = [int(x) for x in bins[:n_cats]]
+    counts.append(int(bins[n_cats:].sum()))
 
     return (categories, counts)
@@ -26,12 +26,11 @@ def import_func_map(upload_contents: str | Path,
     if importer is None:
         raise ValueError("Invalid file format supplied")
     else:
-        # extract file if delivered in archive    
-        file_buffer = upload_to_stringio(upload_contents, archive_format)
-        
-        func_mapper_obj = importer.read_file_buffer(file_buffer, 
-                                                    max_evalue=max_evalue,
-                                                    acc_regex=accession_pattern)
+        # extract file if delivered in archive, buffer is released after parsing
+        with upload_to_stringio(upload_contents, archive_format) as file_buffer:
+            func_mapper_obj = importer.read_file_buffer(file_buffer, 
+                                                        max_evalue=max_evalue,
+                                                        acc_regex=accession_pattern)
         
         return func_mapper_obj
 
@@ -55,10 +54,16 @@ def validate_func_map(file_buffer: str | IO[str],
     if importer is None:
         return False, "Invalid file format supplied"
     else:
+        # only buffers created here are closed after validation
+        created_buffer = None
         try:
             if isinstance(file_buffer, str):
-                file_buffer = upload_to_stringio(file_buffer, archive_format)
+                file_buffer = created_buffer = upload_to_stringio(file_buffer,
+                                                                  archive_format)
             importer.read_file_buffer(file_buffer)
             return True, None
         except Exception as e:
             return False, repr(e)
+        finally:
+            if created_buffer is not None:
+                created_buffer.close()
@@ -4,10 +4,11 @@ objects. This separates it from 'utils's functions, which comprise only basic
 functions at the bottom of the hierarchy."""
 from __future__ import annotations
 
+import re
 from typing import IO, Dict, Callable, Type, TypeAlias, Union
-from copy import deepcopy
+from collections import OrderedDict
 
-from metapepview.backend.utils import custom_groupby, re_find_list
+from metapepview.backend.utils import custom_groupby
 from metapepview.backend.types import *
 from metapepview.backend.types.object_mappings import db_search_importers, de_novo_importers
 
@@ -76,14 +77,14 @@ def load_metapep_db_search(file_buffer: str | IO[str] | Path,
         MetaPepDbSearch: Db search psm data in MetaPep table format
     """
     try:
-        # if path to file given, create TextIOWrapper
-        if isinstance(file_buffer, Path):
-            file_buffer = open(file_buffer, "r", encoding="utf-8")
-
         importer = db_search_importers.get(file_format)
         
         if importer is None:
             raise ValueError("Invalid file format supplied")
+        elif isinstance(file_buffer, Path):
+            # if path to file given, the file is closed again after reading
+            with open(file_buffer, "r", encoding="utf-8") as file:
+                db_search_obj = importer.read_file_buffer(file, sample_name)
         else:
             db_search_obj = importer.read_file_buffer(file_buffer, sample_name)
         
@@ -117,11 +118,12 @@ def load_metapep_de_novo(file_buffer: str | IO[str] | Path,
 
     importer = de_novo_importers.get(file_format)
     try:
-        if isinstance(file_buffer, Path):
-            file_buffer = open(file_buffer, "r", encoding="utf-8")
-            
         if importer is None:
             raise ValueError("Invalid file format supplied")
+        elif isinstance(file_buffer, Path):
+            # if path to file given, the file is closed again after reading
+            with open(file_buffer, "r", encoding="utf-8") as file:
+                de_novo_obj = importer.read_file_buffer(file, sample_name)
         else:
             de_novo_obj = importer.read_file_buffer(file_buffer, sample_name)
         
@@ -169,6 +171,70 @@ def metapep_table_to_peptides(metapep_table: MetaPepDbSearch | MetaPepDeNovo,
                           group_size_name=metapep_table.PEPTIDE_GROUP_NAME)
 
 
+# peptide tables of recently processed datasets, keyed by content fingerprint
+_PEPTIDE_CACHE_SIZE = 8
+_peptide_cache: OrderedDict[Tuple[str, Tuple[str, ...], int], pd.DataFrame] = OrderedDict()
+
+
+def cached_metapep_table_to_peptides(metapep_table: MetaPepDbSearch | MetaPepDeNovo) -> pd.DataFrame:
+    """Group spectral scans into peptide sequence rows using the default
+    aggregation methods. Results are cached by the content of the dataset,
+    such that repeated calls on the same dataset, e.g. from dashboard
+    callbacks that deserialize the dataset each call, skip the groupby.
+
+    Note:
+        The returned dataframe is shared between calls and should not be
+        modified in place.
+
+    Args:
+        metapep_table (MetaPepDbSearch | MetaPepDeNovo): metapep table object,
+            db search or de novo.
+
+    Returns:
+        pd.DataFrame: Aggregated dataset.
+    """
+    data = metapep_table.data
+    key = (type(metapep_table).__name__,
+           tuple(data.columns),
+           int(pd.util.hash_pandas_object(data, index=False).sum()))
+
+    peptides = _peptide_cache.get(key)
+    if peptides is None:
+        peptides = metapep_table_to_peptides(metapep_table)
+        _peptide_cache[key] = peptides
+        if len(_peptide_cache) > _PEPTIDE_CACHE_SIZE:
+            _peptide_cache.popitem(last=False)
+    else:
+        _peptide_cache.move_to_end(key)
+    return peptides
+
+
+def peptide_mz_rt_charge_arrays(metapep_table: MetaPepDbSearch | MetaPepDeNovo,
+                                conf_cutoff: float | None = None) -> Tuple[np.ndarray,
+                                                                           np.ndarray,
+                                                                           np.ndarray]:
+    """Return m/z, retention time and charge arrays of all peptides in a
+    metapep dataset, used to match peptides to spectral features. Peptides are
+    obtained from the cached peptide table.
+
+    Args:
+        metapep_table (MetaPepDbSearch | MetaPepDeNovo): metapep table object,
+            db search or de novo.
+        conf_cutoff (float | None, optional): Only return peptides with a
+            confidence above the cutoff. Defaults to None.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: m/z, RT and charge arrays.
+    """
+    peptides = cached_metapep_table_to_peptides(metapep_table)
+    if conf_cutoff is not None:
+        peptides = peptides[peptides["Confidence"] > conf_cutoff]
+    
+    return (peptides['m/z'].to_numpy(),
+            peptides['RT'].to_numpy(),
+            peptides['Charge'].to_numpy())
+
+
 def metapep_de_novo_to_peptides(metapep_de_novo: MetaPepDeNovo,
                                 aggs_methods: Dict[str, str | Callable] | None=None,
                                 match_idxmax: Dict[str, str | List[str]]| None=None,
@@ -235,11 +301,22 @@ def metapep_db_search_accession_regex(
         acc_delim = GlobalConstants.peptides_accession_delimiter
         peptides = metapep_db_search.data
         
+        acc_pattern = re.compile(acc_regex)
+
+        def extract_accessions(accessions: str) -> str:
+            # apply regex to each accession of a row, keep accessions without match
+            acc_list = accessions.split(acc_delim)
+            for idx, acc in enumerate(acc_list):
+                acc_match = acc_pattern.search(acc)
+                if acc_match is not None:
+                    acc_list[idx] = acc_match.group()
+            return acc_delim.join(acc_list)
+        
         valid_acc = ~peptides[acc_column].isna()
-        # split accessions per row, apply regex to each element, and join again.
-        peptides.loc[valid_acc, acc_column] = peptides.loc[valid_acc, acc_column].str.split(acc_delim)\
-            .apply(re_find_list, pattern = acc_regex)\
-            .apply(lambda x: acc_delim.join(x))
+        # split accessions per row, apply regex to each element, and join again
+        # in a single pass over the rows
+        peptides.loc[valid_acc, acc_column] = peptides.loc[valid_acc, acc_column]\
+            .map(extract_accessions)
         
         metapep_db_search.data = peptides
     
@@ -271,16 +348,19 @@ def rt_from_spectral_data(metapep_table: T,
         MetaPepDbSearch | MetaPepDeNovo: Proteomics dataset supplemented with 
             retention time data.
     """
-    df = deepcopy(metapep_table.data)
+    # only the RT column is replaced, other columns are shared with the input
+    df = metapep_table.data.copy(deep=False)
 
     # check if scan numbers are reported in metapep dataset
     if df["Scan"].isnull().all():
         return metapep_table
     
     # map scan number to retention time in mzml file
-    scan_to_rt = spectral_df.set_index("scan number")["retention time"].to_dict()
+    scan_to_rt = dict(zip(spectral_df["scan number"].to_numpy(),
+                          spectral_df["retention time"].to_numpy()))
 
-    df.loc[:, "RT"] = df["Scan"].apply(lambda x: scan_to_rt.get(x, np.nan))
+    # scans absent from the mzml file are mapped to nan
+    df["RT"] = df["Scan"].map(scan_to_rt)
 
     metapep_table.data = df
 
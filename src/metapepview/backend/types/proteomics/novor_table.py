@@ -6,11 +6,11 @@ import numpy as np
 import pandas as pd
 
 from pathlib import Path
-from typing import Type, Self, Sequence, IO, List
+from typing import Type, Self, Sequence, IO, List, Tuple
 
 from metapepview.backend.types.proteomics.proteomics_base_classes import DbSearchMethods, DeNovoMethods
 from metapepview.backend.types.metapep_table import MetaPepDbSearch, MetaPepDeNovo
-from metapepview.backend.utils import filter_crap, upload_to_stringio, wrangle_peptides
+from metapepview.backend.utils import filter_crap, upload_to_stringio, wrangle_peptide_column, path_stem_column
 
 
 class NovorDeNovo(DeNovoMethods):
@@ -54,6 +54,9 @@ class NovorDeNovo(DeNovoMethods):
     # match everything after '# input file = '
     SOURCE_FILE_PATTERN = re.compile(r"(?<=^# input file = ).+$")
     TABLE_HEADER_PATTERN = re.compile(r"^# id, ")
+    # fixed line prefixes of above patterns
+    SOURCE_FILE_PREFIX = "# input file = "
+    TABLE_HEADER_PREFIX = "# id, "
 
     def __init__(self,
                  data: pd.DataFrame,
@@ -129,35 +132,82 @@ class NovorDeNovo(DeNovoMethods):
         Returns:
             T: Instance of class object
         """
-        # get source file
-        source_file = cls.get_source_file_buffer(file_buffer)
+        # get source file and determine start of data table
+        source_file, skip_rows = cls._scan_header(file_buffer)
         
-        # determine start of data table
-        skip_rows = cls.get_table_start_row(file_buffer)
-        
-        # if data has been decoded, directly return csv DataFrame
+        # if data has been decoded, directly return csv DataFrame. Fields are
+        # separated by ', ', which is parsed as a single character separator
+        # followed by skipped whitespace, allowing use of the C parser engine
         if isinstance(file_buffer, io.TextIOBase):
             df = pd.read_csv(file_buffer, 
                              skiprows=skip_rows, 
-                             delimiter=', ')
+                             sep=',',
+                             skipinitialspace=True)
         elif isinstance(file_buffer, str):
             df = pd.read_csv(upload_to_stringio(file_buffer),
                              skiprows=skip_rows,
-                             delimiter=', ')
+                             sep=',',
+                             skipinitialspace=True)
         else:
             raise TypeError("invalid content type supplied...")
         
         df['Source File'] = source_file
         
-        # remove comment prefix and traling comma for header
-        df = df.rename(columns={"# id": "id",
-                                "aaScore,": "aaScore"})
+        # remove comment prefix for header, the empty column from the trailing
+        # comma of each row is dropped with the other unexpected fields
+        df = df.rename(columns={"# id": "id"})
         
         cls_obj = cls(df, file_name) # type: ignore
         
         return cls_obj
     
 
+    @classmethod
+    def _scan_header(cls, file_buffer: IO[str] | str) -> Tuple[str, int]:
+        """Return spectral file name and line number where data table starts
+        from novor file stream buffer, fetched in a single pass over the
+        metadata rows.
+
+        Args:
+            file_buffer (IO[str] | str): novor file stream buffer.
+
+        Raises:
+            ValueError: Source file or data table not found in the metadata.
+
+        Returns:
+            Tuple[str, int]: Name of spectral file, row number of header names
+        """
+        if isinstance(file_buffer, str):
+            file_buffer = upload_to_stringio(file_buffer)
+        
+        source = None
+        row_num = None
+        # source file is located in the first 20 rows, table headers in the
+        # first 100 rows, stop when both are found. Rows are matched by their
+        # fixed prefix, no regex search needed
+        for idx, row in enumerate(file_buffer):
+            if idx > 100:
+                break
+            
+            if source is None and idx <= 20 and \
+                    row.startswith(cls.SOURCE_FILE_PREFIX):
+                source = row[len(cls.SOURCE_FILE_PREFIX):].rstrip() or None
+            
+            if row.startswith(cls.TABLE_HEADER_PREFIX):
+                row_num = idx
+                break
+        
+        if source is None:
+            raise ValueError("unable to fetch source file from Novor data")
+        if row_num is None:
+            raise ValueError("unable to locate data table")
+        
+        # reset buffer to start of stream to allow subsequent functions to process same stream object
+        file_buffer.seek(0)
+        
+        return Path(source).stem, row_num
+    
+
     @classmethod
     def get_source_file(cls, file_name: Path | str) -> str:
         """Return spectral file name from novor path.
@@ -294,13 +344,11 @@ class NovorDeNovo(DeNovoMethods):
                              'pepMass(denovo)': 'Mass'})
         
         # Wrangle sequence into consistent format (remove PTM, equalte L, I)
-        df.loc[:, 'Sequence'] = df.loc[:, 'Peptide'].apply(wrangle_peptides)
-        df.loc[:, 'Length'] = df.loc[:, 'Sequence'].apply(len)
+        df.loc[:, 'Sequence'] = wrangle_peptide_column(df['Peptide'])
+        df.loc[:, 'Length'] = df['Sequence'].str.len()
         
         # remove file type suffix from Source File column
-        df.loc[:, 'Source File'] = df.loc[:, 'Source File'].apply(
-            lambda x: Path(x).stem
-        )
+        df.loc[:, 'Source File'] = path_stem_column(df['Source File'])
         
         # No Area information supplied in output file
         df['Area'] = np.nan
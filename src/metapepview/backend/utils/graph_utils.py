@@ -139,4 +139,57 @@ def standardize_array_length(sorted_scores: pd.Series,
         score_vals = sorted_scores.values[np.linspace(0, total_matches-1, npoints, dtype=int).tolist()]
     
         return (score_vals, np.linspace(0, 100, npoints))
- 
\ No newline at end of file
+ 
+
+def lttb_downsample_indices(x: np.ndarray,
+                            y: np.ndarray,
+                            n_out: int) -> np.ndarray:
+    """Select indices of datapoints that retain the visual shape of a line
+    using the Largest-Triangle-Three-Buckets (LTTB) algorithm.
+
+    The datapoints between the first and last point are divided into
+    'n_out' - 2 buckets. From each bucket, the point is selected that forms
+    the largest triangle with the previously selected point and the average
+    of the next bucket. This reduces the number of points sent to the browser
+    while keeping peaks and slopes of the line intact.
+
+    Args:
+        x (np.ndarray): x-axis values, sorted.
+        y (np.ndarray): y-axis values, same shape as x.
+        n_out (int): Number of datapoints to select.
+
+    Returns:
+        np.ndarray: Sorted indices of selected datapoints. If the input is
+            not larger than 'n_out', all indices are returned.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n_in = x.shape[0]
+
+    if n_out >= n_in or n_out < 3:
+        return np.arange(n_in)
+
+    # bucket boundaries, first and last point are always selected
+    bucket_edges = (np.arange(n_out - 1) * ((n_in - 2) / (n_out - 2))).astype(int) + 1
+    bucket_edges[-1] = n_in - 1
+
+    out_idx = np.empty(n_out, dtype=np.int64)
+    out_idx[0] = 0
+    out_idx[-1] = n_in - 1
+
+    prev_idx = 0
+    for i in range(n_out - 2):
+        start, end = bucket_edges[i], bucket_edges[i + 1]
+
+        # average of next bucket, last bucket refers to final datapoint
+        next_end = bucket_edges[i + 2] if i + 2 < n_out - 1 else n_in
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        # triangle area (times two) of previous point, bucket points and average
+        area = np.abs((x[prev_idx] - avg_x) * (y[start:end] - y[prev_idx]) -
+                      (x[prev_idx] - x[start:end]) * (avg_y - y[prev_idx]))
+        prev_idx = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        out_idx[i + 1] = prev_idx
+    
+    return out_idx
@@ -175,7 +175,8 @@ def upload_to_stringio(upload_contents: str | Path,
         # either return bytes buffer object, or extract archive and return
         if archive_format is None:
             # convert bytes array to StringIO
-            return io.StringIO(open(upload_contents, "r", encoding="utf-8").read())
+            with open(upload_contents, "r", encoding="utf-8") as file:
+                return io.StringIO(file.read())
         else:
             extracted_content = extract_in_memory_archive(upload_contents,
                                                           archive_format,
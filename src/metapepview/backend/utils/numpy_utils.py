@@ -11,12 +11,18 @@ def match_mz_rt_peaks(mz_array_a: np.ndarray,
                       charge_array_a: np.ndarray,
                       charge_array_b: np.ndarray,
                       mz_threshold: float = 0.01,
-                      rt_threshold: float = 0.5) -> List[Tuple[int, int]]:
+                      rt_threshold: float = 0.5,
+                      batch_size: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
     """
     Finds index pairs (i, j) where mz and RT arrays are both below user defined
     thresholds and charge values are identical. Used to match features to 
     db search or de novo data.
 
+    Matching is performed per charge state. Within a charge state, array b is
+    sorted by RT, after which the RT window of each element in array a is
+    located by binary search. Only the elements of b inside that window are
+    compared on m/z, which is done in vectorized form over batches of array a.
+
     Note:
         It is recommended that the largest array is assigned array a. This way,
         batch processing is most memory efficient.
@@ -30,34 +36,51 @@ def match_mz_rt_peaks(mz_array_a: np.ndarray,
         charge_array_b (np.ndarray): Second charge array, same shape as mz_array_b.
         mz_threshold (float, optional): m/z threshold value. Defaults to 0.01.
         rt_threshold (float, optional): RT threshold value. Defaults to 0.5.
-        batch_size (int, optional): Elements to process in parallel.Defaults to 100.
+        batch_size (int, optional): Elements of array a to process in parallel.
+            Defaults to 1000.
 
     Returns:
-        List[Tuple[int, int]]: List of (i, j) index pairs
+        Tuple[np.ndarray, np.ndarray]: Arrays of matching i and j indices,
+            element k of both arrays forms the (i, j) index pair k.
     """
-    pairs = []
+    a_matches, b_matches = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+
+    # only elements of equal charge can match, process each charge state
+    # separately to reduce the number of candidate pairs in the rt windows
+    for charge in np.intersect1d(charge_array_a, charge_array_b):
+        a_charge_idx = np.flatnonzero(charge_array_a == charge)
+        b_charge_idx = np.flatnonzero(charge_array_b == charge)
 
-    mz_b_sort_idx = np.argsort(mz_array_b)
-    mz_arr_b_sorted = mz_array_b[mz_b_sort_idx]
+        # sort b by retention time, such that the rt window of each a element
+        # is a contiguous slice of the sorted arrays
+        rt_b_sort_idx = b_charge_idx[np.argsort(rt_array_b[b_charge_idx], kind="stable")]
+        rt_arr_b_sorted = rt_array_b[rt_b_sort_idx]
+        mz_arr_b_sorted = mz_array_b[rt_b_sort_idx]
 
-    rt_b_sort_idx = np.argsort(rt_array_b)
-    rt_arr_b_sorted = rt_array_b[rt_b_sort_idx]
+        # window boundaries (inclusive) in sorted b for all a elements at once
+        rt_arr_a = rt_array_a[a_charge_idx]
+        rt_low = np.searchsorted(rt_arr_b_sorted, rt_arr_a - rt_threshold, side="left")
+        rt_high = np.searchsorted(rt_arr_b_sorted, rt_arr_a + rt_threshold, side="right")
 
-    # parse b array with binary search to find matching
-    for idx, a_elem in enumerate(mz_array_a):
-        # Find indices in sorted B where B is within (a - t, a + t)
-        mz_low = np.searchsorted(mz_arr_b_sorted, a_elem - mz_threshold, side="left")
-        mz_high = np.searchsorted(mz_arr_b_sorted, a_elem + mz_threshold, side="right")
+        for start in range(0, a_charge_idx.shape[0], batch_size):
+            stop = min(start + batch_size, a_charge_idx.shape[0])
+            window_low = rt_low[start:stop]
+            window_size = rt_high[start:stop] - window_low
+            total_size = window_size.sum()
+            if total_size == 0:
+                continue
 
-        rt_low = np.searchsorted(rt_arr_b_sorted, rt_array_a[idx] - rt_threshold, side="left")
-        rt_high = np.searchsorted(rt_arr_b_sorted, rt_array_a[idx] + rt_threshold, side="right")
+            # expand windows into flat arrays of candidate (a, sorted b) positions
+            a_idx = np.repeat(a_charge_idx[start:stop], window_size)
+            window_offset = np.arange(total_size) - \
+                np.repeat(np.cumsum(window_size) - window_size, window_size)
+            b_pos = np.repeat(window_low, window_size) + window_offset
 
-        # Map back to original indices of B
-        matching_b_idx_mz = mz_b_sort_idx[mz_low:mz_high]
-        matching_b_idx_rt = rt_b_sort_idx[rt_low:rt_high]
+            mz_a = mz_array_a[a_idx]
+            mz_b = mz_arr_b_sorted[b_pos]
+            is_match = (mz_b >= mz_a - mz_threshold) & (mz_b <= mz_a + mz_threshold)
 
-        for j in np.intersect1d(matching_b_idx_mz, matching_b_idx_rt):
-            # only add if charges are correct
-            if charge_array_b[j] == charge_array_a[idx]:
-                pairs.append((idx, j))
-    return pairs
+            # map back to original indices of b
+            a_matches.append(a_idx[is_match])
+            b_matches.append(rt_b_sort_idx[b_pos[is_match]])
+    return np.concatenate(a_matches), np.concatenate(b_matches)
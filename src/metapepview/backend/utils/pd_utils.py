@@ -3,8 +3,10 @@ Here, string processing is omitted as it is part of the string_utils
 """
 from __future__ import annotations
 
+import re
 from typing import List, Tuple, Dict, Any
 from copy import deepcopy
+from pathlib import Path
 
 import pandas as pd
 import numpy as np
@@ -16,6 +18,10 @@ from metapepview.backend.utils.string_utils import digest_proteins, wrangle_pept
 # return the modus of a pandas series, only the most occuring value
 mode_func = lambda x: pd.Series.mode(x).iat[0]
 
+# characters outside of the amino acid sequence, the complement of
+# `GlobalConstants.sequence_regex`
+non_sequence_regex = re.compile(r"[^A-Z]+")
+
 
 def convert_deprecated_metapeptable_naming(input_df: pd.DataFrame) -> pd.DataFrame:
     """Attempt to fix old metapeptable files where namings of columns have
@@ -144,6 +150,45 @@ def value_to_nan(series: pd.Series,
     return nan_series
 
 
+def wrangle_peptide_column(peptide_col: pd.Series,
+                           ptm_filter: bool=True,
+                           li_swap: bool=True) -> pd.Series:
+    """Process a column of peptide sequences by removing post-translational
+    modifications and/or equating Leucin and Isoleucin amino acids. Column
+    equivalent of `wrangle_peptides` with the default sequence regex, using
+    vectorized string operations. Missing values are kept.
+
+    Args:
+        peptide_col (pd.Series): Series of peptide sequences.
+        ptm_filter (bool, optional): Remove PTM,s from sequence.
+            Defaults to True.
+        li_swap (bool, optional): Equate leucin and isoleucin.
+            Defaults to True.
+
+    Returns:
+        pd.Series: Processed sequence series.
+    """
+    if ptm_filter is True:
+        peptide_col = peptide_col.str.replace(non_sequence_regex, "", regex=True)
+    if li_swap is True:
+        peptide_col = peptide_col.str.replace("L", "I", regex=False)
+    return peptide_col
+
+
+def path_stem_column(path_col: pd.Series) -> pd.Series:
+    """Convert a column of file paths into file names without suffix. Stems
+    are computed once per unique path, which are few in source file columns.
+
+    Args:
+        path_col (pd.Series): Series of file paths.
+
+    Returns:
+        pd.Series: Series of file stems, missing values are kept.
+    """
+    stems = {path: Path(path).stem for path in path_col.dropna().unique()}
+    return path_col.map(stems)
+
+
 def regex_over_column(input_col: pd.Series,
                       pattern: str | re.Pattern,
                       no_match_to_nan: bool = True) -> pd.Series:
@@ -84,6 +84,11 @@ def main():
                         '--de-novo-file-pattern',
                         help="Custom regex pattern used to fetch de novo identification files by file name."
                         )
+    parser.add_argument('-p', 
+                        '--processes',
+                        type=int,
+                        help="Number of worker processes used to process samples in parallel. Defaults to the number of CPUs."
+                        )
     parser.add_argument('directory')
     
     # parse arguments
@@ -156,6 +161,7 @@ def main():
         transmission_loss_percentiles,
         args.db_search_file_pattern,
         args.de_novo_file_pattern,
+        args.processes,
     )
     
     
@@ -216,9 +216,15 @@ class GraphConstants:
     primary_color = px.colors.qualitative.T10[0]
     undefined_color = "#858585"
 
+    # maximum number of datapoints in line traces before downsampling
+    max_line_points = 2000
+
     gridcolor="slategray"
     secondary_grid_color="LightBlue"
     gridwidth=1
+    grid_axis_layout = dict(gridcolor=gridcolor,
+                            gridwidth=gridwidth,
+                            zerolinecolor="Black")
     default_layout = dict(
         margin=dict(l=20, r=20, t=10, b=10),
         paper_bgcolor='rgba(0,0,0,0)',